@@ -20,9 +20,8 @@
 #    Updated by zefie for modern nrsc5 ~ 2019
 #    Updated and enhanced by markjfine ~ 2021-24
 
-import os, pty, select, sys, shutil, re, json, datetime, numpy, glob, time, platform, io
-from subprocess import Popen, PIPE
-from threading import Timer, Thread
+import os, pty, termios, select, sys, shutil, re, json, datetime, numpy, time, platform, io, collections, concurrent.futures, math, socket
+from subprocess import Popen
 from dateutil import tz
 from PIL import Image, ImageFont, ImageDraw, __version__
 
@@ -42,6 +41,19 @@ from OpenSSL import SSL
 
 import musicbrainzngs
 
+# with pycairo the map viewer can keep its frames as cairo surfaces, but it's optional
+try:
+    gi.require_foreign("cairo")
+    haveCairo = True
+except ImportError:
+    haveCairo = False
+
+# orjson is a lot quicker at reading and writing the config files, but it's optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # print debug messages to stdout (if debugger is attached)
 debugMessages = (sys.gettrace() != None)
 debugAutoStart = True
@@ -62,6 +74,183 @@ mapDir = os.path.join(userDataDir, "map")  # map (data we process) file director
 resDir = os.path.join(runtimeDir, "res")  # resource (application dependencies) file directory
 cfgDir = os.path.join(userDataDir, "cfg")  # config file directory
 
+coverNameTable = str.maketrans(" /:", "___")  # characters replaced when naming a downloaded cover
+radarKeyPixbuf = None  # radar key for the map viewer, decoded on first use
+
+# nrsc5 LOT mime types, as defined by iHeartRadio anyway, defined here for possible future use
+mimeTypes = {
+    0x4F328CA0 : ("image/png","png"),
+    0x1E653E9C : ("image/jpg","jpg"),
+    0xBB492AAC : ("text/plain","txt")
+}
+
+# names of the nrsc5 mime type ids
+mimeTypeNames = {
+    0x1E653E9C : "JPEG",
+    0x2D42AC3E : "NavTeq",
+    0x4F328CA0 : "PNG",
+    0x4DC66C5A : "HDC",
+    0x4EB03469 : "TTN TPEG 2",
+    0x52103469 : "TTN TPEG 3",
+    0x82F03DFC : "HERE TPEG",
+    0xB39EBEB2 : "TTN TPEG 1",
+    0xB7F03DFC : "HERE Image",
+    0xB81FFAA8 : "Unknown Test",
+    0xBB492AAC : "Text",
+    0xBE4B7536 : "Primary Image",
+    0xD9C72536 : "Station Logo",
+    0xEECB55B6 : "HD TMC",
+    0xEF042E96 : "TTN STM Weather",
+    0xFF8422D7 : "TTN STM Traffic"
+}
+
+# lookup tables for nrsc5 service and program types
+serviceDataTypes = {
+    0 : "Non_Specific",            
+    1 : "News",                     
+    3 : "Sports",                   
+    29 : "Weather",                  
+    31 : "Emergency",                
+    65 : "Traffic",                  
+    66 : "Image Maps",               
+    80 : "Text",                     
+    256 : "Advertising",              
+    257 : "Financial",                
+    258 : "Stock Ticker",             
+    259 : "Navigation",               
+    260 : "Electronic Program Guide", 
+    261 : "Audio",                    
+    262 : "Private Data Network",     
+    263 : "Service Maintenance",      
+    264 : "HD Radio System Services", 
+    265 : "Audio-Related Objects",       
+    511 : "Reserved for Special Tests"               
+}
+
+programTypes = {
+    0 : "None",
+    1 : "News",
+    2 : "Information",
+    3 : "Sports",
+    4 : "Talk",
+    5 : "Rock",
+    6 : "Classic Rock",
+    7 : "Adult Hits",
+    8 : "Soft Rock",
+    9 : "Top 40",
+    10 : "Country",
+    11 : "Oldies",
+    12 : "Soft",
+    13 : "Nostalgia",
+    14 : "Jazz",
+    15 : "Classical",
+    16 : "Rhythm and Blues",
+    17 : "Soft Rhythm and Blues",
+    18 : "Foreign Language",
+    19 : "Religious Music",
+    20 : "Religious Talk",
+    21 : "Personality",
+    22 : "Public",
+    23 : "College",
+    24 : "Spanish Talk",
+    25 : "Spanish Music",
+    26 : "Hip-Hop",
+    29 : "Weather",
+    30 : "Emergency Test",
+    31 : "Emergency",
+    65 : "Traffic",
+    76 : "Special Reading Services"
+}
+
+# regex for the value of each nrsc5 output keyword that needs one, a line is only matched against the one that can fit
+# (the timestamp and keyword are split off first, plain text fields and status lines are handled by keyword alone,
+# see feedbackFields and feedbackSyncStates)
+nrsc5RegexByKey = {
+    "Audio bit rate"        : re.compile("(.*) kbps$"),                                                 # match audio bit rate
+    "LOT file"              : re.compile("port=([0-9]+) lot=([0-9]+) name=(.*[.](?:jpg|jpeg|png|txt)) size=([0-9]+) mime=([a-zA-Z0-9_]+) .*$"), # match file (album art, maps, weather info)
+    "MER"                   : re.compile("(-?[0-9]+[.][0-9]+) dB [(]lower[)], (-?[0-9]+[.][0-9]+) dB [(]upper[)]$"), # match MER
+    "BER"                   : re.compile("(0[.][0-9]+), avg: (0[.][0-9]+), min: (0[.][0-9]+), max: (0[.][0-9]+)$"), # match BER
+    "Best gain"             : re.compile("(.*) dB,.*$"),                                                # match gain
+    "SIG Service"           : re.compile("type=(.*) number=(.*) name=(.*)$"),                           # match stream
+    "Data component"        : re.compile("(?:.* )?id=([0-9]+).* port=([0-9]+).* service_data_type=([0-9]+) .*$"), # match port (and data_service_type)
+    "XHDR"                  : re.compile("(.*) ([0-9A-Fa-f]{8}) (.*)$"),                                # match xhdr tag
+    "Audio component"       : re.compile("(?:.* )?id=([0-9]+).* port=([0-9]+).* type=([0-9]+) .*$"),    # match port (and type)
+    "Stream data"           : re.compile("port=([0-9]+).* mime=([a-zA-Z0-9_]+) size=([0-9]+)$")         # Navteq/HERE stream info
+}
+
+# nrsc5 keywords whose only value is copied straight into a stream info field
+feedbackFields = {
+    "Title"                 : "Title",
+    "Artist"                : "Artist",
+    "Album"                 : "Album",
+    "Genre"                 : "Genre",
+    "Station name"          : "Callsign",
+    "Slogan"                : "Slogan",
+    "Message"               : "Message",
+    "Alert"                 : "Alert"
+}
+
+# synchronization state set by each nrsc5 status keyword
+feedbackSyncStates = {
+    "Synchronized"          : 1,
+    "Lost synchronization"  : 0,
+    "Lost device"           : -1
+}
+
+# regex for aas file names and weather info
+lotRegex        = re.compile("^([0-9]+)_.*$")                                                           # lot id of an aas file
+tmtRegex        = re.compile("^[0-9]+_TMT_.*_([1-3])_([1-3])_([0-9]{4})([0-9]{2})([0-9]{2})_([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})_([0-9A-Fa-f]{4})[.].*$") # traffic map tile
+dwroRegex       = re.compile("^[0-9]+_DWRO_(.*)_.*_([0-9]{4})([0-9]{2})([0-9]{2})_([0-9]{2})([0-9]{2})_([0-9A-Fa-f]+)[.].*$") # weather overlay
+dwrAreaRegex    = re.compile("^DWR_Area_ID=\"(.+)\"$")                                                  # weather info area id
+weatherMapRegex = re.compile("^.*map.WeatherMap_([a-zA-Z0-9]+)_([0-9]+)[.]png$")                        # saved weather map
+
+# traffic map tiles: row, column, position in the stitched map and file name, in stitching order
+trafficTiles = tuple((i, j, (j*200, i*200), "TrafficMap_{:g}_{:g}.png".format(i,j)) for i in range(3) for j in range(3))
+
+# weather maps older than this many seconds are deleted
+weatherMapMaxAge = 60*60*12
+
+# seconds to wait on a MusicBrainz or Cover Art Archive request before giving up
+musicbrainzTimeout = 10
+
+# compilation albums whose covers aren't used for a track
+coverAlbumExclude = ('hitzone','now that’s what i call music')
+
+# a track that MusicBrainz had no cover for isn't searched again for this many seconds
+coverMissMaxAge = 60*60*24*7
+
+# mercator projection constants for the base map, taken from https://github.com/KYDronePilot/hdfm
+mapProjTop    = math.asinh(math.tan(math.radians(52.482780)))                                           # projected latitude of the top edge
+mapProjYScale = 3565 / (mapProjTop - math.asinh(math.tan(math.radians(38.898))))                        # pixels per projected latitude unit
+mapProjXScale = 7162 / 39.34135                                                                         # pixels per degree of longitude
+
+# key commands that switch nrsc5 to each audio program, already encoded for the pty
+streamKeys = (b"0", b"1", b"2", b"3")
+
+class StreamInfo(object):
+    # stream information, slots keep the lookups in the status update cheap
+    __slots__ = ("Callsign", "Slogan", "Message", "Alert", "Title", "Album", "Genre", "Artist", "Cover", "Logo", "Streams", "Programs", "Services", "SvcTypes", "Bitrate", "MER", "BER", "Gain")
+
+    def __init__(self):
+        self.Callsign = ""                   # station callsign
+        self.Slogan   = ""                   # station slogan
+        self.Message  = ""                   # station message
+        self.Alert    = ""                   # station alert
+        self.Title    = ""                   # track title
+        self.Album    = ""                   # track album
+        self.Genre    = ""                   # track genre
+        self.Artist   = ""                   # track artist
+        self.Cover    = ""                   # filename of track cover
+        self.Logo     = ""                   # station logo
+        self.Streams  = ["","","","","","","",""] # audio stream names
+        self.Programs = ["","","","","","","",""] # audio stream types
+        self.Services = ["","","",""]        # data service names
+        self.SvcTypes = ["","","",""]        # data service types
+        self.Bitrate  = 0                    # current stream bit rate
+        self.MER      = [0,0]                # modulation error ratio: lower, upper
+        self.BER      = [0,0,0,0]            # bit error rate in percent: current, average, min, max
+        self.Gain     = 0                    # automatic gain
+
 class NRSC5_DUI(object):
     def __init__(self):
         global runtimeDir, userDataDir, resDir, imgLANCZOS
@@ -70,7 +259,7 @@ class NRSC5_DUI(object):
 
         self.getControls()              # get controls and windows
         self.initStreamInfo()           # initilize stream info and clear status widgets
-        self.http = urllib3.PoolManager()
+        self.http = urllib3.PoolManager(num_pools=4, maxsize=4, timeout=urllib3.Timeout(connect=2.0, read=5.0), retries=urllib3.Retry(total=2, backoff_factor=0.2))
 
         self.debugLog("Local path determined as " + runtimeDir)
         self.debugLog("User data base directory: " + userDataDir)
@@ -95,6 +284,7 @@ class NRSC5_DUI(object):
         self.web_addr       = "https://github.com/markjfine/nrsc5-dui"
         self.copyright      = "Copyright © 2017-2019 Cody Nybo & Clayton Smith, 2019 zefie, 2021-24 Mark J. Fine"
         musicbrainzngs.set_useragent(self.app_name,self.version,self.web_addr)
+        socket.setdefaulttimeout(musicbrainzTimeout)   # musicbrainzngs requests have no timeout of their own
 
         self.width          = 0         # window width
         self.height         = 0         # window height
@@ -103,7 +293,9 @@ class NRSC5_DUI(object):
         self.nrsc5          = None      # nrsc5 process
         self.nrsc5master    = None      # required for pipe
         self.nrsc5slave     = None      # required for pipe
-        self.playerThread   = None      # player thread
+        self.nrsc5Output    = bytearray() # output received from nrsc5 that doesn't end in a newline yet
+        self.nrsc5Watch     = None      # main loop watch reading nrsc5 output from the pty
+        self.nrsc5WriteWatch = None     # main loop watch sending keystrokes to nrsc5
         self.playing        = False     # currently playing
         self.statusTimer    = None      # status update timer
         self.imageChanged   = False     # has the album art changed
@@ -113,31 +305,53 @@ class NRSC5_DUI(object):
         self.lastImage      = ""        # last image file displayed
         self.coverImage     = ""        # cover image to display
         self.id3Changed     = False     # if the track info changed
+        self.prevTitle      = ""        # title currently shown
+        self.prevArtist     = ""        # artist currently shown
         self.lastXHDR       = ""        # the last XHDR data received
         self.lastLOT        = ""        # the last LOT received with XHDR
         self.stationStr     = ""        # current station frequency (string)
         self.streamNum      = 0         # current station stream number
-        self.nrsc5msg       = ""        # send key command to nrsc5 (streamNum)
+        self.nrsc5msg       = b""       # key command bytes still to be sent to nrsc5 (streamNum)
         self.update_btns    = True      # whether to update the stream buttons
         self.set_program_btns()         # whether to set the stream buttons
         self.bookmarks      = []        # station bookmarks
         self.booknames      = ["","","","","","","",""] # station bookmark names
+        self.bookmarkByFreq = {}        # station bookmarks keyed by packed frequency
+        self.bookmarkIters  = {}        # bookmark listview rows keyed by packed frequency
+        self.bookmarkNames  = {}        # bookmark names per stream, keyed by frequency (MHz*10)
         self.stationLogos   = {}        # station logos
+        self.logoLogLines   = 0         # logo changes appended to stationLogos.log since the database was last written
+        self.logoLogFailed  = False     # a logo change couldn't be logged, so the database has to be rewritten
         self.coverMetas     = {}        # cover metadata
+        self.coverMisses    = {}        # when each cover that couldn't be found online was last searched for
+        self.coverPool      = concurrent.futures.ThreadPoolExecutor(max_workers=2) # workers for online cover searches
+        self.coverPending   = set()     # (artist, title) of cover searches underway
+        self.coverStop      = False     # set on shutdown, cover searches underway give up at the next request
         self.bookmarked     = False     # is current station bookmarked
         self.mapViewer      = None      # map viewer window
         self.weatherMaps    = []        # list of current weathermaps sorted by time
-        self.waittime       = 10        # time in seconds to wait for file to exist
-        self.waitdivider    = 4         # check this many times per second for file
+        self.weatherTimes   = {}        # timestamp of each weathermap in the list, also for quick membership checks
         self.pixbuf         = None      # store image buffer for rescaling on resize
-        self.mimeTypes      = {         # as defined by iHeartRadio anyway, defined here for possible future use
-            "4F328CA0":["image/png","png"],
-            "1E653E9C":["image/jpg","jpg"],
-            "BB492AAC":["text/plain","txt"]
-        }
+        self.pixbufCache    = collections.OrderedDict() # decoded images keyed by (path, mtime)
+        self.scaledCache    = collections.OrderedDict() # scaled images keyed by (path, mtime, size)
+        self.pixbufCacheMax = 32        # number of images to keep in each cache
+        self.logoPixbufs    = {}        # decoded station logos keyed by path
+        self.resizePending  = 0         # source id of a pending cover/map rescale
+        self.resizePool     = concurrent.futures.ThreadPoolExecutor(max_workers=1) # worker for decoding and scaling maps on resize
+        self.mapResizeGen   = 0         # bumped whenever the map is replaced, so a stale rescale is dropped
+        self.windowResizePending = 0    # source id of a pending window rescale
+        self.artworkPending = 0         # source id of a pending artwork swap
+        self.artworkTime    = 0.0       # when the artwork was last swapped
+        self.mapStale       = False     # a new map arrived while the map page was hidden
+        self.lastMaps       = {0: None, 1: None} # last map shown per mode, as (path, mtime, size, pixbuf)
+        self.trafficCanvas  = None      # traffic map tiles stitched so far
+        self.lastTimestamp  = None      # last timestamp tile drawn, with the text it was drawn for
+        self.timestampFont  = None      # font for map timestamps, loaded on first use
+        self.timestampBox   = None      # empty timestamp tile with just the box drawn, made on first use
+        self.baseMaps       = {}        # weather base maps decoded to RGBA, keyed by path
         self.mapData        = {
             "mapMode"       : 1,
-            "mapTiles"      : [[0,0,0],[0,0,0],[0,0,0]],
+            "mapTiles"      : numpy.zeros((3,3), dtype=numpy.int64),
             "mapComplete"   : False,
             "weatherTime"   : 0,
             "weatherPos"    : [0,0,0,0],
@@ -158,112 +372,14 @@ class NRSC5_DUI(object):
             "externalURL"   : ""
         }
 
-        self.ServiceDataType = {
-            0 : "Non_Specific",            
-            1 : "News",                     
-            3 : "Sports",                   
-            29 : "Weather",                  
-            31 : "Emergency",                
-            65 : "Traffic",                  
-            66 : "Image Maps",               
-            80 : "Text",                     
-            256 : "Advertising",              
-            257 : "Financial",                
-            258 : "Stock Ticker",             
-            259 : "Navigation",               
-            260 : "Electronic Program Guide", 
-            261 : "Audio",                    
-            262 : "Private Data Network",     
-            263 : "Service Maintenance",      
-            264 : "HD Radio System Services", 
-            265 : "Audio-Related Objects",       
-            511 : "Reserved for Special Tests"               
-        }
-
-        self.ProgramType = {
-            0 : "None",
-            1 : "News",
-            2 : "Information",
-            3 : "Sports",
-            4 : "Talk",
-            5 : "Rock",
-            6 : "Classic Rock",
-            7 : "Adult Hits",
-            8 : "Soft Rock",
-            9 : "Top 40",
-            10 : "Country",
-            11 : "Oldies",
-            12 : "Soft",
-            13 : "Nostalgia",
-            14 : "Jazz",
-            15 : "Classical",
-            16 : "Rhythm and Blues",
-            17 : "Soft Rhythm and Blues",
-            18 : "Foreign Language",
-            19 : "Religious Music",
-            20 : "Religious Talk",
-            21 : "Personality",
-            22 : "Public",
-            23 : "College",
-            24 : "Spanish Talk",
-            25 : "Spanish Music",
-            26 : "Hip-Hop",
-            29 : "Weather",
-            30 : "Emergency Test",
-            31 : "Emergency",
-            65 : "Traffic",
-            76 : "Special Reading Services"
-        }
-
-        self.MIMETypes = {
-            0x1E653E9C : "JPEG",
-            0x2D42AC3E : "NavTeq",
-            0x4F328CA0 : "PNG",
-            0x4DC66C5A : "HDC",
-            0x4EB03469 : "TTN TPEG 2",
-            0x52103469 : "TTN TPEG 3",
-            0x82F03DFC : "HERE TPEG",
-            0xB39EBEB2 : "TTN TPEG 1",
-            0xB7F03DFC : "HERE Image",
-            0xB81FFAA8 : "Unknown Test",
-            0xBB492AAC : "Text",
-            0xBE4B7536 : "Primary Image",
-            0xD9C72536 : "Station Logo",
-            0xEECB55B6 : "HD TMC",
-            0xEF042E96 : "TTN STM Weather",
-            0xFF8422D7 : "TTN STM Traffic"
-        }
-
         self.pointer_cursor = Gdk.Cursor(Gdk.CursorType.LEFT_PTR)
         self.hand_cursor = Gdk.Cursor(Gdk.CursorType.HAND2)
 
         # set events on info labels
-        self.set_tuning_actions(self.btnAudioPrgs0, "btn_prg0", False, False)
-        self.set_tuning_actions(self.btnAudioPrgs1, "btn_prg1", False, False)
-        self.set_tuning_actions(self.btnAudioPrgs2, "btn_prg2", False, False)
-        self.set_tuning_actions(self.btnAudioPrgs3, "btn_prg3", False, False)
-        self.set_tuning_actions(self.btnAudioPrgs4, "btn_prg4", False, False)
-        self.set_tuning_actions(self.btnAudioPrgs5, "btn_prg5", False, False)
-        self.set_tuning_actions(self.btnAudioPrgs6, "btn_prg6", False, False)
-        self.set_tuning_actions(self.btnAudioPrgs7, "btn_prg7", False, False)
-
-        self.set_tuning_actions(self.lblAudioPrgs0, "prg0", True, True)
-        self.set_tuning_actions(self.lblAudioPrgs1, "prg1", True, True)
-        self.set_tuning_actions(self.lblAudioPrgs2, "prg2", True, True)
-        self.set_tuning_actions(self.lblAudioPrgs3, "prg3", True, True)
-        self.set_tuning_actions(self.lblAudioPrgs4, "prg4", True, True)
-        self.set_tuning_actions(self.lblAudioPrgs5, "prg5", True, True)
-        self.set_tuning_actions(self.lblAudioPrgs6, "prg6", True, True)
-        self.set_tuning_actions(self.lblAudioPrgs7, "prg7", True, True)
-
-        self.set_tuning_actions(self.lblAudioSvcs0, "svc0", True, True)
-        self.set_tuning_actions(self.lblAudioSvcs1, "svc1", True, True)
-        self.set_tuning_actions(self.lblAudioSvcs2, "svc2", True, True)
-        self.set_tuning_actions(self.lblAudioSvcs3, "svc3", True, True)
-        self.set_tuning_actions(self.lblAudioSvcs4, "svc4", True, True)
-        self.set_tuning_actions(self.lblAudioSvcs5, "svc5", True, True)
-        self.set_tuning_actions(self.lblAudioSvcs6, "svc6", True, True)
-        self.set_tuning_actions(self.lblAudioSvcs7, "svc7", True, True)
+        for i in range(8):
+            self.set_tuning_actions(self.audioPrgBtns[i], "btn_prg"+str(i), i, False, False)
+            self.set_tuning_actions(self.audioPrgs[i], "prg"+str(i), i, True, True)
+            self.set_tuning_actions(self.audioSvcs[i], "svc"+str(i), i, True, True)
 
         # setup bookmarks listview
         nameRenderer = Gtk.CellRendererText()
@@ -281,34 +397,15 @@ class NRSC5_DUI(object):
         self.lvBookmarks.append_column(colStation)
         self.lvBookmarks.append_column(colName)
         
-        # regex for getting nrsc5 output
-        self.regex = [
-            re.compile("^[0-9:]{8,8} Station name: (.*)$"),                                                    #  0 match station name
-            re.compile("^[0-9:]{8,8} Station location: (-?[0-9.]+) (-?[0-9.]+), ([0-9]+)m$"),                  #  1 match station location
-            re.compile("^[0-9:]{8,8} Slogan: (.*)$"),                                                          #  2 match station slogan
-            re.compile("^[0-9:]{8,8} Audio bit rate: (.*) kbps$"),                                             #  3 match audio bit rate
-            re.compile("^[0-9:]{8,8} Title: (.*)$"),                                                           #  4 match title
-            re.compile("^[0-9:]{8,8} Artist: (.*)$"),                                                          #  5 match artist
-            re.compile("^[0-9:]{8,8} Album: (.*)$"),                                                           #  6 match album
-            re.compile("^[0-9:]{8,8} LOT file: port=([0-9]+) lot=([0-9]+) name=(.*[.](?:jpg|jpeg|png|txt)) size=([0-9]+) mime=([a-zA-Z0-9_]+) .*$"), #  7 match file (album art, maps, weather info)
-            re.compile("^[0-9:]{8,8} MER: (-?[0-9]+[.][0-9]+) dB [(]lower[)], (-?[0-9]+[.][0-9]+) dB [(]upper[)]$"), #  8 match MER
-            re.compile("^[0-9:]{8,8} BER: (0[.][0-9]+), avg: (0[.][0-9]+), min: (0[.][0-9]+), max: (0[.][0-9]+)$"), #  9 match BER
-            re.compile("^Best gain: (.*) dB,.*$"),                                                             # 10 match gain
-            re.compile("^[0-9:]{8,8} SIG Service: type=(.*) number=(.*) name=(.*)$"),                          # 11 match stream
-            re.compile("^[0-9:]{8,8} .*Data component:.* id=([0-9]+).* port=([0-9]+).* service_data_type=([0-9]+) .*$"), # 12 match port (and data_service_type)
-            re.compile("^[0-9:]{8,8} XHDR: (.*) ([0-9A-Fa-f]{8}) (.*)$"),                                      # 13 match xhdr tag
-            re.compile("^[0-9:]{8,8} Unique file identifier: PPC;07; ([a-zA-Z0-9_.]+).*$"),                    # 14 match unique file id
-            re.compile("^[0-9:]{8,8} Genre: (.*)$"),                                                           # 15 match genre
-            re.compile("^[0-9:]{8,8} Message: (.*)$"),                                                         # 16 match message
-            re.compile("^[0-9:]{8,8} Alert: (.*)$"),                                                           # 17 match alert
-            re.compile("^[0-9:]{8,8} .*Audio component:.* id=([0-9]+).* port=([0-9]+).* type=([0-9]+) .*$"),   # 18 match port (and type)
-            re.compile("^[0-9:]{8,8} Synchronized$"),                                                          # 19 synchronized
-            re.compile("^[0-9:]{8,8} Lost synchronization$"),                                                  # 20 lost synch
-            re.compile("^[0-9:]{8,8} Lost device$"),                                                           # 21 lost device
-            re.compile("^[0-9:]{8,8} Open device failed.$"),                                                   # 22 No device
-            re.compile("^[0-9:]{8,8} Stream data: port=([0-9]+).* mime=([a-zA-Z0-9_]+) size=([0-9]+)$"),       # 23 Navteq/HERE stream info
-            re.compile("^[0-9:]{8,8} Packet data: port=([0-9]+).* mime=([a-zA-Z0-9_]+) size=([0-9]+)$")        # 24 Navteq/HERE packet info
-        ]
+        # regex for getting nrsc5 output, compiled once at module load
+        self.regexByKey = nrsc5RegexByKey
+
+        # map and weather files carried over LOT, by the tag after the lot id in the file name
+        self.lotHandlers = {
+            "DWRO" : self.processWeatherOverlay,
+            "TMT"  : self.processTrafficMap,
+            "DWRI" : self.proccessWeatherInfo
+        }
         
         self.loadSettings()
         self.proccessWeatherMaps()
@@ -316,16 +413,23 @@ class NRSC5_DUI(object):
         # set up pty
         self.nrsc5master,self.nrsc5slave = pty.openpty()
 
-    def set_tuning_actions(self, widget, name, has_win, set_curs):
+        # nrsc5 writes its output to the pty too, so don't echo keystrokes back or turn \n into \r\n
+        attrs = termios.tcgetattr(self.nrsc5slave)
+        attrs[1] &= ~termios.ONLCR
+        attrs[3] &= ~termios.ECHO
+        termios.tcsetattr(self.nrsc5slave, termios.TCSANOW, attrs)
+
+    def set_tuning_actions(self, widget, name, stream_num, has_win, set_curs):
         widget.set_property("name",name)
         widget.set_sensitive(False)
         if has_win:
             widget.set_has_window(True)
-        widget.set_events(Gdk.EventMask.BUTTON_PRESS_MASK)
-        widget.connect("button-press-event", self.on_program_select)
         if set_curs:
-            widget.add_events(Gdk.EventMask.ENTER_NOTIFY_MASK)
+            widget.set_events(Gdk.EventMask.BUTTON_PRESS_MASK | Gdk.EventMask.ENTER_NOTIFY_MASK)
             widget.connect("enter-notify-event", self.on_enter_set_cursor)
+        else:
+            widget.set_events(Gdk.EventMask.BUTTON_PRESS_MASK)
+        widget.connect("button-press-event", self.on_program_select, stream_num, has_win)       # labels have their own window, buttons don't
 
     def on_enter_set_cursor(self, widget, event):
         if (widget.get_label() != ""):
@@ -382,11 +486,6 @@ class NRSC5_DUI(object):
         self.cbDevIP.set_visible(not(useSDRPlay))
         self.cbDevIP.set_can_focus(not(useSDRPlay))
 
-    def img_to_pixbuf(self,img):
-        """convert PIL.Image to GdkPixbuf.Pixbuf"""
-        data = GLib.Bytes.new(img.tobytes())
-        return GdkPixbuf.Pixbuf.new_from_bytes(data, GdkPixbuf.Colorspace.RGB, 'A' in img.getbands(),8, img.width, img.height, len(img.getbands())*img.width)
-
     def did_resize(self):
         result = False
         width, height = self.mainWindow.get_size()
@@ -396,81 +495,141 @@ class NRSC5_DUI(object):
             result = True
         return result
 
+    def cache_pixbuf(self, cache, key, pixbuf):
+        cache[key] = pixbuf
+        cache.move_to_end(key)
+        while (len(cache) > self.pixbufCacheMax):
+            cache.popitem(last=False)
+
+    def get_scaled_pixbuf(self, path, size, orig=None):
+        """return the image at path scaled to size x size, only decoding and scaling it on a cache miss"""
+        if (orig is not None):
+            # an already decoded logo, forget_logo drops its scaled copies when it changes, so no stat is needed
+            key = ("logo", path, size)
+        else:
+            mtime = os.path.getmtime(path)
+            key = (path, mtime, size)
+        pixbuf = self.scaledCache.get(key)
+        if (pixbuf is not None):
+            self.scaledCache.move_to_end(key)
+            return pixbuf
+
+        if (orig is None):
+            orig = self.pixbufCache.get((path, mtime))
+            if (orig is None):
+                orig = GdkPixbuf.Pixbuf.new_from_file(path)
+                self.cache_pixbuf(self.pixbufCache, (path, mtime), orig)
+            else:
+                self.pixbufCache.move_to_end((path, mtime))
+        pixbuf = orig.scale_simple(size, size, GdkPixbuf.InterpType.BILINEAR)
+        self.cache_pixbuf(self.scaledCache, key, pixbuf)
+        return pixbuf
+
+    def forget_logo(self, path):
+        # drop the decoded logo at path and its scaled copies, the file has been replaced
+        self.logoPixbufs.pop(path, None)
+        for key in [k for k in self.scaledCache if k[0] == "logo" and k[1] == path]:
+            del self.scaledCache[key]
+
     def on_cover_resize(self, container):
-        global mapDir, imgLANCZOS
+        # coalesce a burst of resize events into a single rescale at the final size
+        if (self.resizePending == 0):
+            self.resizePending = GLib.timeout_add(30, self.do_cover_resize)
+
+    def do_cover_resize(self):
+        global mapDir
+        self.resizePending = 0
         if (self.did_resize()):
             self.showArtwork(self.coverImage)
 
             img_size = min(self.alignmentMap.get_allocated_height(), self.alignmentMap.get_allocated_width()) - 12           
             if (self.mapData["mapMode"] == 0):
-                map_file = os.path.join(mapDir, "TrafficMap.png")
-                if os.path.isfile(map_file):
-                    map_img = Image.open(map_file).resize((img_size, img_size), imgLANCZOS)
-                    self.imgMap.set_from_pixbuf(self.img_to_pixbuf(map_img))
-                else:
-                    self.imgMap.set_from_icon_name("MISSING_IMAGE", Gtk.IconSize.DIALOG)
+                self.resize_map(os.path.join(mapDir, "TrafficMap.png"), img_size)
             elif (self.mapData["mapMode"] == 1):
-                if os.path.isfile(self.mapData["weatherNow"]):
-                    map_img = Image.open(self.mapData["weatherNow"]).resize((img_size, img_size), imgLANCZOS)
-                    self.imgMap.set_from_pixbuf(self.img_to_pixbuf(map_img))
-                else:
-                    self.imgMap.set_from_icon_name("MISSING_IMAGE", Gtk.IconSize.DIALOG)
+                self.resize_map(self.mapData["weatherNow"], img_size)
+        return False
+
+    def resize_map(self, map_file, img_size):
+        # show the map rescaled to img_size, decoding and scaling it on the worker if it isn't cached
+        self.mapResizeGen += 1
+        try:
+            mtime = os.path.getmtime(map_file)
+        except OSError:
+            self.imgMap.set_from_icon_name("MISSING_IMAGE", Gtk.IconSize.DIALOG)
+            return
+        key = (map_file, mtime, img_size)
+        pixbuf = self.scaledCache.get(key)
+        if (pixbuf is not None):
+            self.scaledCache.move_to_end(key)
+            self.imgMap.set_from_pixbuf(pixbuf)
+            return
+        gen = self.mapResizeGen
+        future = self.resizePool.submit(GdkPixbuf.Pixbuf.new_from_file_at_size, map_file, img_size, img_size)
+        future.add_done_callback(lambda f: GLib.idle_add(self.apply_map_resize, gen, key, f))
 
-    def id3_did_change(self):
-        oldTitle = self.txtTitle.get_label().strip()
-        oldArtist = self.txtArtist.get_label().strip()
-        newTitle = self.streamInfo["Title"].strip()
-        newArtist = self.streamInfo["Artist"].strip()
-        return ((newArtist != oldArtist) and (newTitle != oldTitle))
+    def apply_map_resize(self, gen, key, future):
+        if (gen != self.mapResizeGen):
+            return False                                                                                # a newer resize or map has been shown since
+        try:
+            pixbuf = future.result()
+        except (GLib.Error, concurrent.futures.CancelledError):
+            self.imgMap.set_from_icon_name("MISSING_IMAGE", Gtk.IconSize.DIALOG)
+            return False
+        self.cache_pixbuf(self.scaledCache, key, pixbuf)
+        self.imgMap.set_from_pixbuf(pixbuf)
+        return False
+
+    def id3_did_change(self, newTitle, newArtist):
+        # a new track can keep the artist (or the title), so either one changing counts
+        return ((newArtist != self.prevArtist) or (newTitle != self.prevTitle))
 
     def fix_artist(self):
-        newArtist = self.streamInfo["Artist"]
-        if ("/" in newArtist):
-            m = re.search(r"/",newArtist)
-            if (m.start() > -1):
-                newArtist = newArtist[:m.start()].strip()
-        return newArtist
-
-    def check_value(self,arg,group,default):
-        result = default
-        if(arg in group):
-            result = group[arg]
-        return result
+        newArtist, sep, rest = self.streamInfo.Artist.partition("/")
+        if (sep):
+            return newArtist.strip()
+        return self.streamInfo.Artist
 
     def check_terms(self,inStr,terms):
-        result = False
-        for term in terms:
-            result=(term in inStr)
-            if result:
-                break
-        return result
+        # terms are expected in lower case
+        inStr = inStr.lower()
+        return any(term in inStr for term in terms)
   
+    def musicbrainz_not_found(self, e):
+        # the Cover Art Archive answers 404 for a release without any cover art
+        return isinstance(e, musicbrainzngs.ResponseError) and (getattr(e.cause, "code", None) == 404)
+
     def check_musicbrainz_cover(self,inID):
+        # returns True if the release has an approved front cover, False if not, or None if the lookup failed
         result = False
         imageList = None
 
         try:
             imageList = musicbrainzngs.get_image_list(inID)
-        except:
-            print("MusicBrainz image list retrieval error for id "+inID)
+        except Exception as e:
+            if (not self.musicbrainz_not_found(e)):
+                print("MusicBrainz image list retrieval error for id "+inID)
+                return None
 
         if (imageList is not None) and ('images' in imageList):
             for (idx, image) in enumerate(imageList['images']):
-                imgTypes = self.check_value('types', image, None)
-                imgApproved = self.check_value('approved', image, "False")
+                imgTypes = image.get('types', ())
+                imgApproved = image.get('approved', False)
                 result = ('Front' in imgTypes) and imgApproved
                 if (result):
                     break
         return result
 
     def save_musicbrainz_cover(self,inID,saveStr):
+        # returns True if the cover was saved, False if there is none, or None if the download failed
         imgData = None
         result = False
 
         try:
             imgData = musicbrainzngs.get_image_front(inID, size="500")
-        except:
-            print("MusicBrainz image retrieval error for id "+inID)
+        except Exception as e:
+            if (not self.musicbrainz_not_found(e)):
+                print("MusicBrainz image retrieval error for id "+inID)
+                return None
 
         if (imgData is not None) and (len(imgData) > 0):
             dataBytes = io.BytesIO(imgData)
@@ -481,166 +640,244 @@ class NRSC5_DUI(object):
 
     def get_cover_image_online(self):
         global aasDir
-        got_cover = False
-        albumExclude = ['hitzone','now that’s what i call music']
 
         # only care about the first artist listed if separated by slashes
         newArtist = self.fix_artist().replace("'","’")
-
-        setExtend = (self.cbExtend.get_sensitive() and self.cbExtend.get_active())
-        searchArtist = newArtist
-        newTitle = self.streamInfo["Title"].replace("'","’")
-        baseStr = str(newArtist+" - "+self.streamInfo["Title"]).replace(" ","_").replace("/","_").replace(":","_")+".jpg"
+        newTitle = self.streamInfo.Title.replace("'","’")
+        baseStr = (newArtist+" - "+self.streamInfo.Title).translate(coverNameTable)+".jpg"
         saveStr = os.path.join(aasDir, baseStr)
 
         if ((newArtist=="") and (newTitle=="")):
             self.displayLogo()
-            self.streamInfo['Album']=""
-            self.streamInfo['Genre']=""
+            self.streamInfo.Album=""
+            self.streamInfo.Genre=""
             return
 
         # does it already exist?
         if (os.path.isfile(saveStr)):
             self.coverImage = saveStr
             if (baseStr in self.coverMetas):
-                self.streamInfo['Album'] = self.coverMetas[baseStr][2]
-                self.streamInfo['Genre'] = self.coverMetas[baseStr][3]
+                self.streamInfo.Album = self.coverMetas[baseStr][2]
+                self.streamInfo.Genre = self.coverMetas[baseStr][3]
+
+            # now display it by simulating a window resize
+            self.showArtwork(self.coverImage)
+
+        # if not, get it from MusicBrainz in the background, unless that's already underway
+        elif ((newArtist, newTitle) not in self.coverPending):
+            track = (newArtist, newTitle, self.streamInfo.Artist, self.streamInfo.Title, baseStr, saveStr)
+            if (time.time() - self.coverMisses.get(baseStr, 0) < coverMissMaxAge):
+                self.apply_cover_image(track, None)                                             # searched recently and nothing was found
+                return
+            self.coverPending.add((newArtist, newTitle))
+            setExtend = (self.cbExtend.get_sensitive() and self.cbExtend.get_active())
+            future = self.coverPool.submit(self.find_musicbrainz_cover, newArtist, newTitle, setExtend, saveStr)
+            future.add_done_callback(lambda f: None if (f.cancelled()) else GLib.idle_add(self.apply_cover_image, track, f.result()))
+
+    def find_musicbrainz_cover(self, newArtist, newTitle, setExtend, saveStr):
+        # runs on a worker thread, returns [album, genre] if a cover was saved to saveStr,
+        # False if MusicBrainz has none, or None if a lookup failed
+        searchArtist = newArtist
+        searchFailed = False
+        try:
+            imgSaved = False
+            i = 1
+
+            while (not imgSaved):
+                if (self.coverStop):
+                    return None                                                                 # shutting down
+                setStrict = (i in [1,3,5,7])
+                setType = ''
+                if (i in [1,2,3,4]):
+                    setType = 'Album'
+                setStatus = ''
+                if (i in [1,2,5,6]):
+                    setStatus = 'Official'
+
+                result = None
+
+                try:
+                    result = musicbrainzngs.search_recordings(strict=setStrict, artist=searchArtist, recording=newTitle, type=setType, status=setStatus)
+                except:
+                    searchFailed = True
+                    print("MusicBrainz recording search error")
+                    print("iteration =",i,".")
+                    print("imgSaved =",imgSaved,".")
+                    print("strict =",setStrict,".")
+                    print("artist =",searchArtist,".")
+                    print("recording =",newTitle,".")
+                    print("type =",setType,".")
+                    print("status =",setStatus,".")
+
+                if (result is not None) and ('recording-list' in result) and (len(result['recording-list']) != 0):    
+                    # loop through the list until you get a match
+                    for (idx, release) in enumerate(result['recording-list']):
+                        resultID = release.get('id',"")
+                        resultScore = release.get('ext:score',"0")
+                        resultArtist = release.get('artist-credit-phrase',"")
+                        resultTitle = release.get('title',"")
+                        resultTags = release.get('tag-list') or [{}]
+                        resultGenre = resultTags[0].get('name',"")
+                        scoreMatch = (int(resultScore) > 90)
+                        artistMatch = (newArtist.lower() in resultArtist.lower())
+                        titleMatch = (newTitle.lower() in resultTitle.lower())
+                        recordingMatch = (artistMatch and titleMatch and scoreMatch)
+
+                        # don't bother dealing with releases if artist, title and score don't match
+                        resultStatus = ""
+                        resultType = ""
+                        resultAlbum = ""
+                        resultArtist2 = ""
+                        releaseMatch = False
+                        imageMatch = False
+                        if recordingMatch and ('release-list' in release):
+                            for (idx2, release2) in enumerate(release['release-list']):
+                                imageMatch = False
+                                resultID = release2.get('id',"")
+                                resultStatus = release2.get('status',"Official")
+                                resultType = release2.get('release-group',{}).get('type',"")
+                                resultAlbum = release2.get('title',"")
+                                resultArtist2 = release2.get('artist-credit-phrase',"")
+                                typeMatch = (resultType in ['Single','Album','EP'])
+                                statusMatch = (resultStatus == 'Official')
+                                albumMatch = (not self.check_terms(resultAlbum, coverAlbumExclude))
+                                artistMatch2 = (not ('Various' in resultArtist2))
+                                releaseMatch = (artistMatch2 and albumMatch and typeMatch and statusMatch)
+                                # don't bother checking for covers unless album, type, and status match
+                                if (self.coverStop):
+                                    return None                                                 # shutting down
+                                if releaseMatch:
+                                    imageMatch = self.check_musicbrainz_cover(resultID)
+                                    if (imageMatch is None):
+                                        searchFailed = True
+                                        imageMatch = False
+                                if (releaseMatch and imageMatch and ((idx2+1) < len(release['release-list']))):
+                                    break
+
+                        if (recordingMatch and releaseMatch and imageMatch):
+ 
+                            # got a full match, now get the cover art
+                            saved = self.save_musicbrainz_cover(resultID,saveStr)
+                            if saved:
+                                return [resultAlbum, resultGenre]
+                            if (saved is None):
+                                searchFailed = True
+
+                        if (not scoreMatch):
+                            break
+
+                i = i + 1
+                # if Strict was false the first time through, there's no need to run through it again
+                if (i == 9) or ((not setExtend) and (i == 2)):
+                    break
+        except:
+            print("general error in the musicbrainz routine")
+            return None
+        return None if (searchFailed) else False
 
-        # if not, get it from MusicBrainz
+    def apply_cover_image(self, track, found):
+        global aasDir
+        newArtist, newTitle, artist, title, baseStr, saveStr = track
+        self.coverPending.discard((newArtist, newTitle))
+        if (found):
+            self.coverMetas[baseStr] = [title, artist, found[0], found[1]]
+        elif (found is False):
+            self.coverMisses[baseStr] = int(time.time())                                        # don't search for it again for a while
+
+        # the track may have changed while we were searching
+        if (self.streamInfo.Artist != artist) or (self.streamInfo.Title != title):
+            return False
+
+        if (found):
+            self.coverImage = saveStr
+            self.streamInfo.Album = found[0]
+            self.streamInfo.Genre = found[1]
         else:
+            # If no match use the station logo if there is one
             try:
-                imgSaved = False
-                i = 1
-
-                while (not imgSaved):
-                    setStrict = (i in [1,3,5,7])
-                    setType = ''
-                    if (i in [1,2,3,4]):
-                        setType = 'Album'
-                    setStatus = ''
-                    if (i in [1,2,5,6]):
-                        setStatus = 'Official'
-
-                    result = None
-    
-                    try:
-                        result = musicbrainzngs.search_recordings(strict=setStrict, artist=searchArtist, recording=newTitle, type=setType, status=setStatus)
-                    except:
-                        print("MusicBrainz recording search error")
-                        print("iteration =",i,".")
-                        print("imgSaved =",imgSaved,".")
-                        print("strict =",setStrict,".")
-                        print("artist =",searchArtist,".")
-                        print("recording =",newTitle,".")
-                        print("type =",setType,".")
-                        print("status =",setStatus,".")
-    
-                    if (result is not None) and ('recording-list' in result) and (len(result['recording-list']) != 0):    
-                        # loop through the list until you get a match
-                        for (idx, release) in enumerate(result['recording-list']):
-                            resultID = self.check_value('id',release,"")
-                            resultScore = self.check_value('ext:score',release,"0")
-                            resultArtist = self.check_value('artist-credit-phrase',release,"")
-                            resultTitle = self.check_value('title',release,"")
-                            resultGenre = self.check_value('name',self.check_value('tag-list',release,""),"")
-                            scoreMatch = (int(resultScore) > 90)
-                            artistMatch = (newArtist.lower() in resultArtist.lower())
-                            titleMatch = (newTitle.lower() in resultTitle.lower())
-                            recordingMatch = (artistMatch and titleMatch and scoreMatch)
-    
-                            # don't bother dealing with releases if artist, title and score don't match
-                            resultStatus = ""
-                            resultType = ""
-                            resultAlbum = ""
-                            resultArtist2 = ""
-                            releaseMatch = False
-                            imageMatch = False
-                            if recordingMatch and ('release-list' in release):
-                                for (idx2, release2) in enumerate(release['release-list']):
-                                    imageMatch = False
-                                    resultID = self.check_value('id',release2,"")
-                                    resultStatus = self.check_value('status',release2,"Official")
-                                    resultType = self.check_value('type',self.check_value('release-group',release2,""),"")
-                                    resultAlbum = self.check_value('title',release2,"")
-                                    resultArtist2 = self.check_value('artist-credit-phrase',release2,"")
-                                    typeMatch = (resultType in ['Single','Album','EP'])
-                                    statusMatch = (resultStatus == 'Official')
-                                    albumMatch = (not self.check_terms(resultAlbum, albumExclude))
-                                    artistMatch2 = (not ('Various' in resultArtist2))
-                                    releaseMatch = (artistMatch2 and albumMatch and typeMatch and statusMatch)
-                                    # don't bother checking for covers unless album, type, and status match
-                                    if releaseMatch:
-                                        imageMatch = self.check_musicbrainz_cover(resultID)
-                                    if (releaseMatch and imageMatch and ((idx2+1) < len(release['release-list']))):
-                                        break
-    
-                            if (recordingMatch and releaseMatch and imageMatch):
-     
-                                # got a full match, now get the cover art
-                                if self.save_musicbrainz_cover(resultID,saveStr):
-                                    self.coverImage = saveStr
-                                    imgSaved = True
-                                    self.streamInfo['Album']=resultAlbum
-                                    self.streamInfo['Genre']=resultGenre
-                                    self.coverMetas[baseStr] = [self.streamInfo["Title"],self.streamInfo["Artist"],self.streamInfo["Album"],self.streamInfo["Genre"]]
-
-                            if (imgSaved) and ((idx+1) < len(result['recording-list'])) or (not scoreMatch):
-                                break
-
-                    i = i + 1
-                    # if we got an image or Strict was false the first time through, there's no need to run through it again
-                    if (imgSaved) or (i == 9) or ((not setExtend) and (i == 2)):
-                        break
-
-                # If no match use the station logo if there is one
-                if (not imgSaved):
-                    self.coverImage = os.path.join(aasDir, self.stationLogos[self.stationStr][self.streamNum])
-                    self.streamInfo['Album']=""
-                    self.streamInfo['Genre']=""
-            except:
-                print("general error in the musicbrainz routine")
+                self.coverImage = os.path.join(aasDir, self.stationLogos[self.stationStr][self.streamNum])
+            except KeyError:
+                pass
+            self.streamInfo.Album=""
+            self.streamInfo.Genre=""
 
         # now display it by simulating a window resize
         self.showArtwork(self.coverImage)
+        return False
 
-    def showArtwork(self, art):
+    def showArtwork(self, art, pb=None):
         if (art != "") and (art[-5:] != "/aas/"):
+            if (pb is None):
+                pb = self.logoPixbufs.get(art)
             img_size = min(self.alignmentCover.get_allocated_height(), self.alignmentCover.get_allocated_width()) - 12
-            self.pixbuf = GdkPixbuf.Pixbuf.new_from_file(art)
-            self.pixbuf = self.pixbuf.scale_simple(img_size, img_size, GdkPixbuf.InterpType.BILINEAR)
+            self.pixbuf = self.get_scaled_pixbuf(art, img_size, pb)
             self.imgCover.set_from_pixbuf(self.pixbuf)
 
+    def queue_artwork(self, art):
+        # swap the artwork at most twice a second, a station flipping between cover and logo only shows the last one
+        if (self.artworkPending != 0):
+            GLib.source_remove(self.artworkPending)
+            self.artworkPending = 0
+        wait = 0.5 - (time.monotonic() - self.artworkTime)
+        if (wait <= 0):
+            self.do_show_artwork(art)
+        else:
+            self.artworkPending = GLib.timeout_add(int(wait*1000)+1, self.do_show_artwork, art)
+
+    def do_show_artwork(self, art):
+        self.artworkPending = 0
+        self.artworkTime = time.monotonic()
+        self.showArtwork(art)
+        return False
+
+    def get_logo_pixbuf(self, logo):
+        # decode a station logo once, it's shown again for every song on the station
+        pb = self.logoPixbufs.get(logo)
+        if (pb is None):
+            pb = GdkPixbuf.Pixbuf.new_from_file(logo)
+            self.logoPixbufs[logo] = pb
+        return pb
+
+    def set_station_logo(self, stream, fileName):
+        global cfgDir
+        # record a station logo, appending the change to a log rather than rewriting the whole database
+        logos = self.stationLogos.setdefault(self.stationStr, ["", "", "", "", "", "", "", ""])
+        if (logos[stream] == fileName):
+            return
+        logos[stream] = fileName
+        try:
+            with open(os.path.join(cfgDir,"stationLogos.log"), mode='a') as f:
+                f.write(json.dumps([self.stationStr, stream, fileName]) + "\n")
+            self.logoLogLines += 1
+        except:
+            self.logoLogFailed = True
+
     def displayLogo(self):
         global aasDir
         if (self.stationStr in self.stationLogos):
             # show station logo if it's cached
             logo = os.path.join(aasDir, self.stationLogos[self.stationStr][self.streamNum])
-            if (os.path.isfile(logo)):
-                self.streamInfo["Logo"] = self.stationLogos[self.stationStr][self.streamNum]
+            if (logo in self.logoPixbufs) or (os.path.isfile(logo)):
+                self.streamInfo.Logo = self.stationLogos[self.stationStr][self.streamNum]
                 self.coverImage = logo
-                self.showArtwork(logo)
+                self.showArtwork(logo, self.get_logo_pixbuf(logo))
         else:
             # add entry in database for the station if it doesn't exist
             self.stationLogos[self.stationStr] = ["", "", "", "", "", "", "", ""]
 
-    def service_data_type_name(self, type):
-        for key, value in self.ServiceDataType.items():
-            if (key == type):
-               return value
-
-    def program_type_name(self, type):
-        for key, value in self.ProgramType.items():
-            if (key == type):
-               return value
-
     def handle_window_resize(self):
         if (self.pixbuf != None):
-            desired_size = min(self.alignmentCover.get_allocated_height(), self.alignmentCover.get_allocated_width()) - 12
-            self.pixbuf = self.pixbuf.scale_simple(desired_size, desired_size, GdkPixbuf.InterpType.BILINEAR)
-            self.imgCover.set_from_pixbuf(self.pixbuf)
+            # rescale from the cached original rather than the last scaled copy
+            self.showArtwork(self.coverImage)
 
     def on_window_resized(self,window):
+        if (self.windowResizePending == 0):
+            self.windowResizePending = GLib.timeout_add(30, self.do_window_resize)
+
+    def do_window_resize(self):
+        self.windowResizePending = 0
         self.handle_window_resize()
+        return False
 
     def on_btnPlay_clicked(self, btn):
         global aasDir
@@ -669,9 +906,9 @@ class NRSC5_DUI(object):
             
             # set gain if auto gain is not selected
             if (not self.cbAutoGain.get_active()):
-                self.streamInfo["Gain"] = round(self.spinGain.get_value(),2)
+                self.streamInfo.Gain = round(self.spinGain.get_value(),2)
                 self.nrsc5Args.append("-g")
-                self.nrsc5Args.append(str(self.streamInfo["Gain"]))
+                self.nrsc5Args.append(str(self.streamInfo.Gain))
             
             # set ppm error if not zero
             if (self.spinPPM.get_value() != 0):
@@ -708,8 +945,7 @@ class NRSC5_DUI(object):
             print(self.nrsc5Args)
 
             # start the timer
-            self.statusTimer = Timer(1, self.checkStatus)
-            self.statusTimer.start()
+            self.statusTimer = GLib.timeout_add_seconds(1, self.checkStatus)
             
             # disable the controls
             self.spinFreq.set_sensitive(False)
@@ -729,20 +965,15 @@ class NRSC5_DUI(object):
             self.lastXHDR = ""
             self.lastLOT = ""
 
-            # start the player thread
-            self.playerThread = Thread(target=self.play)
-            self.playerThread.start()
+            # start nrsc5, its output is handled from the main loop
+            self.start_nrsc5()
             
             self.stationStr = str(self.spinFreq.get_value())
             self.displayLogo()         
             
             # check if station is bookmarked
-            self.bookmarked = False
             freq = int((self.spinFreq.get_value()+0.005)*100) + int(self.streamNum + 1)
-            for b in self.bookmarks:
-                if (b[2] == freq):
-                    self.bookmarked = True
-                    break
+            self.bookmarked = (freq in self.bookmarkByFreq)
 
             self.get_bookmark_names()
 
@@ -751,12 +982,22 @@ class NRSC5_DUI(object):
                 self.btnDelete.set_sensitive(self.bookmarked)
     
     def get_bookmark_names(self):
-        self.booknames = ["","","","","","","",""]
-        freq = str(int((self.spinFreq.get_value()+0.005)*10))
-        for b in self.bookmarks:
-            test = str(b[2])
-            if (test[:-1] == freq):
-                self.booknames[int(test[-1])-1] = b[1]
+        freq = int((self.spinFreq.get_value()+0.005)*10)
+        self.booknames = list(self.bookmarkNames.get(freq, ["","","","","","","",""]))
+        self.stationDirty = True
+
+    def index_bookmark(self, bookmark):
+        # add a bookmark to the frequency and name lookups
+        freq = bookmark[2]
+        self.bookmarkByFreq[freq] = bookmark
+        self.bookmarkNames.setdefault(freq // 10, ["","","","","","","",""])[freq % 10 - 1] = bookmark[1]
+
+    def unindex_bookmark(self, freq):
+        # remove a bookmark from the frequency and name lookups
+        self.bookmarkByFreq.pop(freq, None)
+        self.bookmarkIters.pop(freq, None)
+        if ((freq // 10) in self.bookmarkNames):
+            self.bookmarkNames[freq // 10][freq % 10 - 1] = ""
 
     def on_btnStop_clicked(self, btn):
         # stop playback
@@ -767,12 +1008,13 @@ class NRSC5_DUI(object):
             if (self.nrsc5 is not None and not self.nrsc5.poll()):
                 self.nrsc5.terminate()
             
-            if (self.playerThread is not None) and (btn is not None):
-                self.playerThread.join(1)
-            
             # stop timer
-            self.statusTimer.cancel()
-            self.statusTimer = None
+            if (self.statusTimer is not None):
+                GLib.source_remove(self.statusTimer)
+                self.statusTimer = None
+            if (self.artworkPending != 0):
+                GLib.source_remove(self.artworkPending)
+                self.artworkPending = 0
             
             # enable controls
             if (not self.cbAutoGain.get_active()):
@@ -805,12 +1047,13 @@ class NRSC5_DUI(object):
         # create bookmark
         bookmark = [
             "{:4.1f}-{:1.0f}".format(self.spinFreq.get_value(), self.streamNum + 1),
-            self.streamInfo["Callsign"],
+            self.streamInfo.Callsign,
             freq
         ]
         self.bookmarked = True                  # mark as bookmarked
         self.bookmarks.append(bookmark)         # store bookmark in array
-        self.lsBookmarks.append(bookmark)       # add bookmark to listview
+        self.index_bookmark(bookmark)           # add bookmark to lookups
+        self.bookmarkIters[freq] = self.lsBookmarks.append(bookmark) # add bookmark to listview
         self.btnBookmark.set_sensitive(False)   # disable bookmark button
         
         if (self.notebookMain.get_current_page() != 3):
@@ -822,10 +1065,9 @@ class NRSC5_DUI(object):
         # select current station if not on bookmarks page
         if (self.notebookMain.get_current_page() != 3):
             station = int((self.spinFreq.get_value()+0.005)*100) + int(self.streamNum + 1)
-            for i in range(0, len(self.lsBookmarks)):
-                if (self.lsBookmarks[i][2] == station):            
-                    self.lvBookmarks.set_cursor(i)
-                    break
+            iter = self.bookmarkIters.get(station)
+            if (iter is not None):
+                self.lvBookmarks.set_cursor(self.lsBookmarks.get_path(iter))
         
         # get station of selected row
         (model, iter) = self.lvBookmarks.get_selection().get_selected()
@@ -835,10 +1077,10 @@ class NRSC5_DUI(object):
         model.remove(iter)
         
         # remove bookmark
-        for i in range(0, len(self.bookmarks)):
-            if (self.bookmarks[i][2] == station):
-                self.bookmarks.pop(i)
-                break
+        bookmark = self.bookmarkByFreq.get(station)
+        if (bookmark is not None):
+            self.bookmarks.remove(bookmark)
+        self.unindex_bookmark(station)
         
         if (self.notebookMain.get_current_page() != 3 and self.playing):
             self.btnBookmark.set_sensitive(True)
@@ -905,32 +1147,27 @@ class NRSC5_DUI(object):
     def on_stream_changed(self):
         self.lastXHDR = ""
         self.lastLOT = ""
-        self.streamInfo["Title"] = ""
-        self.streamInfo["Album"] = ""
-        self.streamInfo["Artist"] = ""
-        self.streamInfo["Genre"] = ""
-        self.streamInfo["Cover"] = ""
-        self.streamInfo["Logo"] = ""
-        self.streamInfo["Bitrate"] = 0
+        self.streamInfo.Title = ""
+        self.streamInfo.Album = ""
+        self.streamInfo.Artist = ""
+        self.streamInfo.Genre = ""
+        self.streamInfo.Cover = ""
+        self.streamInfo.Logo = ""
+        self.streamInfo.Bitrate = 0
         self.set_program_btns()
         if self.playing:
-            self.nrsc5msg = str(self.streamNum)
+            if (0 <= self.streamNum < len(streamKeys)):
+                self.send_nrsc5(streamKeys[self.streamNum])
             self.displayLogo()
 
     def set_program_btns(self):
-        self.btnAudioPrgs0.set_active(self.update_btns and self.streamNum == 0)
-        self.btnAudioPrgs1.set_active(self.update_btns and self.streamNum == 1)
-        self.btnAudioPrgs2.set_active(self.update_btns and self.streamNum == 2)
-        self.btnAudioPrgs3.set_active(self.update_btns and self.streamNum == 3)
-        self.btnAudioPrgs4.set_active(self.update_btns and self.streamNum == 4)
-        self.btnAudioPrgs5.set_active(self.update_btns and self.streamNum == 5)
-        self.btnAudioPrgs6.set_active(self.update_btns and self.streamNum == 6)
-        self.btnAudioPrgs7.set_active(self.update_btns and self.streamNum == 7)
+        for i, btn in enumerate(self.audioPrgBtns):
+            active = (self.update_btns and self.streamNum == i)
+            if (btn.get_active() != active):
+                btn.set_active(active)
         self.update_btns = True
 
-    def on_program_select(self, _label, evt):
-        stream_num = int(_label.get_property("name")[-1])
-        is_lbl = _label.get_property("name")[0] != "b"
+    def on_program_select(self, _label, evt, stream_num, is_lbl):
         self.update_btns = is_lbl
         self.streamNum = stream_num
         self.on_stream_changed()
@@ -950,12 +1187,17 @@ class NRSC5_DUI(object):
             self.streamNum = (station%10)-1
             self.on_stream_changed()
             
-            # stop playback if playing
+            # stop playback if playing, and give nrsc5 a second to let go of the radio without blocking the main loop
             if (self.playing):
-                 self.on_btnStop_clicked(None)
-            time.sleep(1)
-            # play bookmarked station
-            self.on_btnPlay_clicked(None)
+                self.on_btnStop_clicked(None)
+                GLib.timeout_add_seconds(1, self.play_bookmark)
+            else:
+                self.play_bookmark()
+
+    def play_bookmark(self):
+        # play bookmarked station
+        self.on_btnPlay_clicked(None)
+        return False
 
     def on_lvBookmarks_selection_changed(self, tree_selection):
         # enable delete button if bookmark is selected
@@ -968,10 +1210,10 @@ class NRSC5_DUI(object):
         self.lsBookmarks.set(iter, 1, text)
         
         # update name in bookmarks array
-        for b in self.bookmarks:
-            if (b[2] == self.lsBookmarks[path][2]):
-                b[1] = text
-                break
+        b = self.bookmarkByFreq.get(self.lsBookmarks[path][2])
+        if (b is not None):
+            b[1] = text
+            self.index_bookmark(b)
 
     def on_notebookMain_switch_page(self, notebook, page, page_num):
         # disable delete button if not on bookmarks page and station is not bookmarked
@@ -984,30 +1226,60 @@ class NRSC5_DUI(object):
         else:
             (model, iter) = self.lvBookmarks.get_selection().get_selected()
             self.btnDelete.set_sensitive(iter is not None)
+
+        # show a map that arrived while the map page was hidden
+        if (page_num == 4 and self.mapStale):
+            self.mapStale = False
+            if (self.mapData["mapMode"] == 0):
+                self.on_radMap_toggled(self.radMapTraffic)
+            else:
+                self.on_radMap_toggled(self.radMapWeather)
+
+    def map_page_visible(self):
+        return (self.notebookMain.get_current_page() == 4 and self.mainWindow.get_visible())
     
     def on_radMap_toggled(self, btn):
-        global mapDir, imgLANCZOS
+        global mapDir
         if (btn.get_active()):
             img_size = min(self.alignmentMap.get_allocated_height(), self.alignmentMap.get_allocated_width()) - 12
             if (img_size < 200):
                 img_size = 200
             if (btn == self.radMapTraffic):
-                self.mapData["mapMode"] = 0
+                mode = 0
                 mapFile = os.path.join(mapDir, "TrafficMap.png")
-                if (os.path.isfile(mapFile)):                                                           # check if map exists
-                    mapImg = Image.open(mapFile).resize((img_size, img_size), imgLANCZOS)                       # scale map to fit window
-                    self.imgMap.set_from_pixbuf(imgToPixbuf(mapImg))                                    # convert image to pixbuf and display
-                else:
-                    self.imgMap.set_from_icon_name("MISSING_IMAGE", Gtk.IconSize.DIALOG)                # display missing image if file is not found
-            
             elif (btn == self.radMapWeather):
-                self.mapData["mapMode"] = 1
-                if (os.path.isfile(self.mapData["weatherNow"])):
-                    mapImg = Image.open(self.mapData["weatherNow"]).resize((img_size, img_size), imgLANCZOS)    # scale map to fit window
-                    self.imgMap.set_from_pixbuf(imgToPixbuf(mapImg))                                    # convert image to pixbuf and display 
-                else:
-                    self.imgMap.set_from_icon_name("MISSING_IMAGE", Gtk.IconSize.DIALOG)                # display missing image if file is not found
-    
+                mode = 1
+                mapFile = self.mapData["weatherNow"]
+            else:
+                return
+            self.mapData["mapMode"] = mode
+            self.mapResizeGen += 1                                                                      # drop any rescale still in flight
+
+            # redisplay the map last shown in this mode right away, then check for a newer one when idle
+            last = self.lastMaps[mode]
+            if (last is not None and last[0] == mapFile and last[2] == img_size):
+                self.imgMap.set_from_pixbuf(last[3])
+                GLib.idle_add(self.refresh_map, mode, mapFile, img_size, priority=GLib.PRIORITY_LOW)
+            else:
+                self.refresh_map(mode, mapFile, img_size)
+
+    def refresh_map(self, mode, mapFile, img_size):
+        if (self.mapData["mapMode"] != mode):
+            return False                                                                                # mode was toggled again before we got here
+        try:
+            mtime = os.path.getmtime(mapFile)                                                           # check if map exists
+        except OSError:
+            self.lastMaps[mode] = None
+            self.imgMap.set_from_icon_name("MISSING_IMAGE", Gtk.IconSize.DIALOG)                        # display missing image if file is not found
+            return False
+        last = self.lastMaps[mode]
+        if (last is None or last[:3] != (mapFile, mtime, img_size)):
+            mapImg = scaleImage(Image.open(mapFile), (img_size, img_size))                              # scale map to fit window
+            pixbuf = imgToPixbuf(mapImg)                                                                # convert image to pixbuf
+            self.lastMaps[mode] = (mapFile, mtime, img_size, pixbuf)
+            self.imgMap.set_from_pixbuf(pixbuf)                                                         # and display
+        return False
+
     def on_btnMap_clicked(self, btn):
         # open map viewer window
         if (self.mapViewer is None):
@@ -1038,7 +1310,7 @@ class NRSC5_DUI(object):
         self.slPopup = None
         if (self.slData['externalURL'] != ""):
             freq = int((self.spinFreq.get_value()+0.005)*100) + int(self.streamNum + 1)
-            fileName = str(freq)+"_SL"+self.streamInfo["Callsign"]+"$$"+str(int(self.streamNum + 1))
+            fileName = str(freq)+"_SL"+self.streamInfo.Callsign+"$$"+str(int(self.streamNum + 1))
             for extension in extensions:
                 if extension in self.slData['externalURL']:
                     useExt = extension
@@ -1048,44 +1320,87 @@ class NRSC5_DUI(object):
                 saveStr=os.path.join(aasDir,fileName)
                 with self.http.request('GET',self.slData['externalURL'], preload_content=False) as r, open(saveStr, 'wb') as out_file:
                     if(r.status == 200):
-                        shutil.copyfileobj(r, out_file)
-                        self.stationLogos[self.stationStr][self.streamNum] = fileName
+                        shutil.copyfileobj(r, out_file, 65536)
+                        self.set_station_logo(self.streamNum, fileName)
+                        self.forget_logo(saveStr)
                         self.displayLogo()
 
-    def play(self):
-        FNULL = open(os.devnull, 'w')
-        FTMP = open('tmp.log','w')
+    def start_nrsc5(self):
+        # drop anything a previous run left unread on the pty
+        fd = self.nrsc5master
+        while (select.select([fd],[],[],0)[0]):
+            if (not os.read(fd, 65536)):
+                break
+        self.nrsc5Output.clear()
 
-        # run nrsc5 and output stdout & stderr to pipes
-        self.nrsc5 = Popen(self.nrsc5Args, shell=False, stdin=self.nrsc5slave, stdout=PIPE, stderr=PIPE, universal_newlines=True)
-        
-        while True:
-            # send input to nrsc5 if needed
-            if (self.nrsc5msg != ""):
-                select.select([],[self.nrsc5master],[])
-                os.write(self.nrsc5master,str.encode(self.nrsc5msg))
-                self.nrsc5msg = ""
-            # read output from nrsc5
-            output = self.nrsc5.stderr.readline()
-            # parse the output
+        # run nrsc5 with stdin, stdout & stderr all on the pty
+        self.nrsc5 = Popen(self.nrsc5Args, shell=False, stdin=self.nrsc5slave, stdout=self.nrsc5slave, stderr=self.nrsc5slave)
+        GLib.child_watch_add(GLib.PRIORITY_DEFAULT, self.nrsc5.pid, self.on_nrsc5_exit, self.nrsc5)
+
+        # only wake up when nrsc5 has output for us
+        if (self.nrsc5Watch is None):
+            self.nrsc5Watch = GLib.io_add_watch(fd, GLib.PRIORITY_DEFAULT, GLib.IO_IN, self.on_nrsc5_output)
+
+    def restart_nrsc5(self):
+        if (self.playing):
+            self.start_nrsc5()
+        return False
+
+    def on_nrsc5_output(self, fd, condition):
+        # read whatever output nrsc5 has ready in one block, then parse it a line at a time
+        try:
+            chunk = os.read(fd, 65536)
+        except OSError:
+            return True
+        outputBuf = self.nrsc5Output
+        outputBuf.extend(chunk)
+
+        # take every complete line at once, a partial last line waits for the next read
+        end = outputBuf.rfind(b"\n")
+        if (end < 0):
+            return True
+        block = bytes(outputBuf[:end+1])
+        del outputBuf[:end+1]
+
+        # write output to log file if enabled
+        if (self.cbLog.get_active() and self.logFile is not None):
+            self.logFile.write(block)
+            self.logFile.flush()
+
+        # a newline byte never falls inside a utf-8 sequence, so the block decodes on its own
+        for output in block.decode("utf-8", "replace").split("\n")[:-1]:
             self.parseFeedback(output)
-            
-            # write output to log file if enabled
-            if (self.cbLog.get_active() and self.logFile is not None):
-                self.logFile.write(output)
-                self.logFile.flush()
-            
-            # check if nrsc5 has exited
-            if (self.nrsc5.poll() and not self.playing):
-                # cleanup if shutdown
-                self.debugLog("Process Terminated")
-                self.nrsc5 = None
-                break
-            elif (self.nrsc5.poll() and self.playing):
-                # restart nrsc5 if it crashes
-                self.debugLog("Restarting NRSC5")
-                time.sleep(1)
-                self.nrsc5 = Popen(self.nrsc5Args, shell=False, stdin=self.nrsc5slave, stdout=PIPE, stderr=PIPE, universal_newlines=True)
+        return True
+
+    def on_nrsc5_exit(self, pid, status, proc):
+        # ignore a process we already replaced
+        if (proc is not self.nrsc5):
+            return
+        if (self.playing):
+            # restart nrsc5 if it crashes
+            self.debugLog("Restarting NRSC5")
+            GLib.timeout_add_seconds(1, self.restart_nrsc5)
+        else:
+            # cleanup if shutdown
+            self.debugLog("Process Terminated")
+            self.nrsc5 = None
+            if (self.nrsc5Watch is not None):
+                GLib.source_remove(self.nrsc5Watch)
+                self.nrsc5Watch = None
+
+    def send_nrsc5(self, msg):
+        # send key command to nrsc5 as soon as the pty will take it
+        self.nrsc5msg = msg
+        if (self.nrsc5WriteWatch is None):
+            self.nrsc5WriteWatch = GLib.io_add_watch(self.nrsc5master, GLib.PRIORITY_DEFAULT, GLib.IO_OUT, self.on_nrsc5_writable)
+
+    def on_nrsc5_writable(self, fd, condition):
+        sent = os.write(fd, self.nrsc5msg)
+        self.nrsc5msg = self.nrsc5msg[sent:]
+        if (self.nrsc5msg):
+            return True
+        self.nrsc5WriteWatch = None
+        return False
 
     def set_synchronization(self, state):
         self.imgNoSynch.set_visible(state == 0)
@@ -1093,22 +1408,29 @@ class NRSC5_DUI(object):
         self.imgLostDevice.set_visible(state == -1)
 
     def set_button_name(self, btnWidget, lblWidget, stream):
-        temp = self.streamInfo["Streams"][stream]
+        temp = self.streamInfo.Streams[stream]
         if ((temp == "") or (temp == "MPS") or (temp[0:3] == "SPS") or (temp[0:2] == "HD") ):
             if (self.booknames[stream] != ""):
                 temp = self.booknames[stream]
-        lblWidget.set_label(temp)
-        btnWidget.set_sensitive(temp != "")
+        if (self.set_label_cached(lblWidget, temp)):
+            btnWidget.set_sensitive(temp != "")
 
     def set_label_name(self, lblWidget, inString, doSens):
-        lblWidget.set_label(inString)
-        lblWidget.set_tooltip_text(inString)
-        if (doSens):
+        if (self.set_label_cached(lblWidget, inString, True) and doSens):
             lblWidget.set_sensitive(inString != "")
 
+    def set_label_cached(self, lblWidget, inString, tooltip=False):
+        # skip the GTK calls if the label already shows this text, returns True if it changed
+        if (self.lblCache.get(lblWidget) == inString):
+            return False
+        self.lblCache[lblWidget] = inString
+        lblWidget.set_label(inString)
+        if (tooltip):
+            lblWidget.set_tooltip_text(inString)
+        return True
+
     def getImageLot(self,imgStr):
-        r = re.compile("^([0-9]+)_.*$")
-        m = r.match(imgStr)
+        m = lotRegex.match(imgStr)
         return m.group(1)
 
     def checkStatus(self):
@@ -1118,88 +1440,64 @@ class NRSC5_DUI(object):
             try:
                 imagePath = ""
                 image = ""
-                ber = [self.streamInfo["BER"][i]*100 for i in range(4)]
-                self.id3Changed = self.id3_did_change()
-                self.txtTitle.set_text(self.streamInfo["Title"])
-                self.txtTitle.set_tooltip_text(self.streamInfo["Title"])
-                self.txtArtist.set_text(self.streamInfo["Artist"])
-                self.txtArtist.set_tooltip_text(self.streamInfo["Artist"])
-                self.txtAlbum.set_text(self.streamInfo["Album"])
-                self.txtAlbum.set_tooltip_text(self.streamInfo["Album"])
-                self.txtGenre.set_text(self.streamInfo["Genre"])
-                self.txtGenre.set_tooltip_text(self.streamInfo["Genre"])
-                self.lblBitRate.set_label("{:3.1f} kbps".format(self.streamInfo["Bitrate"]))
-                self.lblBitRate2.set_label("{:3.1f} kbps".format(self.streamInfo["Bitrate"]))
-                self.lblError.set_label("{:2.2f}% BER ".format(self.streamInfo["BER"][0]*100))
-                self.lblCall.set_label(" " + self.streamInfo["Callsign"])
-                self.lblName.set_label(self.streamInfo["Callsign"])
-                self.lblSlogan.set_label(self.streamInfo["Slogan"])
-                self.lblSlogan.set_tooltip_text(self.streamInfo["Slogan"])
-                self.lblMessage.set_label(self.streamInfo["Message"])
-                self.lblMessage.set_tooltip_text(self.streamInfo["Message"])
-                if (self.txtMessage2):
-                    self.txtMessage2.set_label(self.streamInfo["Message"])
-                    self.txtMessage2.set_tooltip_text(self.streamInfo["Message"])
-                self.lblAlert.set_label(self.streamInfo["Alert"])
-                self.lblAlert.set_tooltip_text(self.streamInfo["Alert"])
-                if (self.txtAlert2):
-                    self.txtAlert2.set_label(self.streamInfo["Alert"])
-                    self.txtAlert2.set_tooltip_text(self.streamInfo["Alert"])
-                self.set_button_name(self.btnAudioPrgs0,self.btnAudioLbl0,0)
-                self.set_button_name(self.btnAudioPrgs1,self.btnAudioLbl1,1)
-                self.set_button_name(self.btnAudioPrgs2,self.btnAudioLbl2,2)
-                self.set_button_name(self.btnAudioPrgs3,self.btnAudioLbl3,3)
-                self.set_button_name(self.btnAudioPrgs4,self.btnAudioLbl4,4)
-                self.set_button_name(self.btnAudioPrgs5,self.btnAudioLbl5,5)
-                self.set_button_name(self.btnAudioPrgs6,self.btnAudioLbl6,6)
-                self.set_button_name(self.btnAudioPrgs7,self.btnAudioLbl7,7)
-                self.set_label_name(self.lblAudioPrgs0, self.streamInfo["Streams"][0], True)
-                self.set_label_name(self.lblAudioPrgs1, self.streamInfo["Streams"][1], True)
-                self.set_label_name(self.lblAudioPrgs2, self.streamInfo["Streams"][2], True)
-                self.set_label_name(self.lblAudioPrgs3, self.streamInfo["Streams"][3], True)
-                self.set_label_name(self.lblAudioPrgs4, self.streamInfo["Streams"][4], True)
-                self.set_label_name(self.lblAudioPrgs5, self.streamInfo["Streams"][5], True)
-                self.set_label_name(self.lblAudioPrgs6, self.streamInfo["Streams"][6], True)
-                self.set_label_name(self.lblAudioPrgs7, self.streamInfo["Streams"][7], True)
-                self.set_label_name(self.lblAudioSvcs0, self.streamInfo["Programs"][0], True)
-                self.set_label_name(self.lblAudioSvcs1, self.streamInfo["Programs"][1], True)
-                self.set_label_name(self.lblAudioSvcs2, self.streamInfo["Programs"][2], True)
-                self.set_label_name(self.lblAudioSvcs3, self.streamInfo["Programs"][3], True)
-                self.set_label_name(self.lblAudioSvcs4, self.streamInfo["Programs"][4], True)
-                self.set_label_name(self.lblAudioSvcs5, self.streamInfo["Programs"][5], True)
-                self.set_label_name(self.lblAudioSvcs6, self.streamInfo["Programs"][6], True)
-                self.set_label_name(self.lblAudioSvcs7, self.streamInfo["Programs"][7], True)
-                self.set_label_name(self.lblDataSvcs0, self.streamInfo["Services"][0], False)
-                self.set_label_name(self.lblDataSvcs1, self.streamInfo["Services"][1], False)
-                self.set_label_name(self.lblDataSvcs2, self.streamInfo["Services"][2], False)
-                self.set_label_name(self.lblDataSvcs3, self.streamInfo["Services"][3], False)
-                self.set_label_name(self.lblDataType0, self.streamInfo["SvcTypes"][0], False)
-                self.set_label_name(self.lblDataType1, self.streamInfo["SvcTypes"][1], False)
-                self.set_label_name(self.lblDataType2, self.streamInfo["SvcTypes"][2], False)
-                self.set_label_name(self.lblDataType3, self.streamInfo["SvcTypes"][3], False)
-                self.lblMerLower.set_label("{:1.2f} dB".format(self.streamInfo["MER"][0]))
-                self.lblMerUpper.set_label("{:1.2f} dB".format(self.streamInfo["MER"][1]))
-                self.lblBerNow.set_label("{:1.3f}% (Now)".format(ber[0]))
-                self.lblBerAvg.set_label("{:1.3f}% (Avg)".format(ber[1]))
-                self.lblBerMin.set_label("{:1.3f}% (Min)".format(ber[2]))
-                self.lblBerMax.set_label("{:1.3f}% (Max)".format(ber[3]))
+                info = self.streamInfo
+                berNow, berAvg, berMin, berMax = info.BER
+                newTitle = info.Title.strip()
+                newArtist = info.Artist.strip()
+                self.id3Changed = self.id3_did_change(newTitle, newArtist)
+                self.set_label_cached(self.txtTitle, info.Title, True)
+                self.set_label_cached(self.txtArtist, info.Artist, True)
+                self.prevTitle = newTitle
+                self.prevArtist = newArtist
+                self.set_label_cached(self.txtAlbum, info.Album, True)
+                self.set_label_cached(self.txtGenre, info.Genre, True)
+                bitRate = "{:3.1f} kbps".format(info.Bitrate)
+                self.set_label_cached(self.lblBitRate, bitRate)
+                self.set_label_cached(self.lblBitRate2, bitRate)
+                self.set_label_cached(self.lblError, "{:2.2f}% BER ".format(berNow))
+
+                # station and program labels only change when nrsc5 reports something new
+                if (self.stationDirty):
+                    self.stationDirty = False
+                    self.set_label_cached(self.lblCall, " " + info.Callsign)
+                    self.set_label_cached(self.lblName, info.Callsign)
+                    self.set_label_cached(self.lblSlogan, info.Slogan, True)
+                    self.set_label_cached(self.lblMessage, info.Message, True)
+                    if (self.txtMessage2):
+                        self.set_label_cached(self.txtMessage2, info.Message, True)
+                    self.set_label_cached(self.lblAlert, info.Alert, True)
+                    if (self.txtAlert2):
+                        self.set_label_cached(self.txtAlert2, info.Alert, True)
+                    for i in range(8):
+                        self.set_button_name(self.audioPrgBtns[i], self.audioPrgLbls[i], i)
+                        self.set_label_name(self.audioPrgs[i], info.Streams[i], True)
+                        self.set_label_name(self.audioSvcs[i], info.Programs[i], True)
+                    for i in range(4):
+                        self.set_label_name(self.dataSvcs[i], info.Services[i], False)
+                        self.set_label_name(self.dataTypes[i], info.SvcTypes[i], False)
+                self.set_label_cached(self.lblMerLower, "{:1.2f} dB".format(info.MER[0]))
+                self.set_label_cached(self.lblMerUpper, "{:1.2f} dB".format(info.MER[1]))
+                self.set_label_cached(self.lblBerNow, "{:1.3f}% (Now)".format(berNow))
+                self.set_label_cached(self.lblBerAvg, "{:1.3f}% (Avg)".format(berAvg))
+                self.set_label_cached(self.lblBerMin, "{:1.3f}% (Min)".format(berMin))
+                self.set_label_cached(self.lblBerMax, "{:1.3f}% (Max)".format(berMax))
 
                 if (self.cbAutoGain.get_active()):
-                    self.spinGain.set_value(self.streamInfo["Gain"])
-                    self.lblGain.set_label("{:2.1f} dB".format(self.streamInfo["Gain"]))
+                    self.spinGain.set_value(info.Gain)
+                    self.set_label_cached(self.lblGain, "{:2.1f} dB".format(info.Gain))
                 
                 # second param is lot id, if -1, show cover, otherwise show cover
                 # technically we should show the file with the matching lot id
 
                 lot = -1
-                if ((self.lastXHDR == "0") and (self.streamInfo["Cover"] != "")):
-                    imagePath = os.path.join(aasDir, self.streamInfo["Cover"])
-                    image = self.streamInfo["Cover"]
+                if ((self.lastXHDR == "0") and (info.Cover != "")):
+                    imagePath = os.path.join(aasDir, info.Cover)
+                    image = info.Cover
                     lot = self.getImageLot(image)
-                elif (((self.lastXHDR == "1") or (self.lastImage != "")) and (self.streamInfo["Logo"] != "")):
-                    imagePath = os.path.join(aasDir, self.streamInfo["Logo"])
-                    image = self.streamInfo["Logo"]
-                    if (not os.path.isfile(imagePath)):
+                elif (((self.lastXHDR == "1") or (self.lastImage != "")) and (info.Logo != "")):
+                    imagePath = os.path.join(aasDir, info.Logo)
+                    image = info.Logo
+                    if (image != self.lastImage) and (not os.path.isfile(imagePath)):
                         self.imgCover.clear()
                         self.coverImage = ""
                     
@@ -1208,25 +1506,28 @@ class NRSC5_DUI(object):
                     self.xhdrChanged = False
                     self.lastImage = image
                     self.coverImage = imagePath
-                    self.showArtwork(imagePath)
+                    self.queue_artwork(imagePath)
                     self.debugLog("Image Changed")
 
                 # Disable downloaded cover images until fixed with MusicBrainz
                 if (self.cbCovers.get_active() and self.id3Changed):
                     self.get_cover_image_online()
 
-            finally:
-                pass        
+            except Exception as e:
+                # keep the status timer alive, an error here would otherwise cancel it for good
+                self.debugLog("Error: Unable to update status: {}", e, force=True)
         
         if (self.playing):
-            GLib.idle_add(update)
-            self.statusTimer = Timer(1, self.checkStatus)
-            self.statusTimer.start()
+            update()                    # already on the main loop, no need to go through idle_add
+        else:
+            self.statusTimer = None
+
+        # keep the timer running while playing
+        return self.playing
     
     def processTrafficMap(self, fileName):
         global aasDir, mapDir, imgLANCZOS
-        r = re.compile("^[0-9]+_TMT_.*_([1-3])_([1-3])_([0-9]{4})([0-9]{2})([0-9]{2})_([0-9A-Fa-f]{2})([0-9A-Fa-f]{2})_([0-9A-Fa-f]{4})[.].*$")     # match file name
-        m = r.match(fileName)
+        m = tmtRegex.match(fileName)                                                                    # match file name
         
         if (m):
             x       = int(m.group(1))-1 # X position
@@ -1238,62 +1539,74 @@ class NRSC5_DUI(object):
             ts = dtToTs(dt)                                                                             # unix timestamp (utc)
             
             # check if the tile has already been loaded
-            if (self.mapData["mapTiles"][x][y] == ts):
+            if (self.mapData["mapTiles"][x,y] == ts):
                 try:
                     os.remove(os.path.join(aasDir, fileName))                                           # delete this tile, it's not needed
-                except:
+                except OSError:
                     pass
                 return                                                                                  # no need to recreate the map if it hasn't changed
             
-            self.debugLog("Got Traffic Map Tile: {:g},{:g}".format(x,y))
+            self.debugLog("Got Traffic Map Tile: {:g},{:g}", x, y)
                 
             self.mapData["mapComplete"]    = False                                                      # new tiles are coming in, the map is nolonger complete
-            self.mapData["mapTiles"][x][y] = ts                                                         # store time for current tile
+            self.mapData["mapTiles"][x,y] = ts                                                        # store time for current tile
             
             try:
                 currentPath = os.path.join(aasDir,fileName)
-                newPath = os.path.join(mapDir, "TrafficMap_{:g}_{:g}.png".format(x,y))                  # create path to new tile location
-                if(os.path.exists(newPath)): os.remove(newPath)                                         # delete old image if it exists (only necessary on windows)
+                newPath = os.path.join(mapDir, trafficTiles[x*3+y][3])                                  # create path to new tile location
+                try:
+                    os.remove(newPath)                                                                  # delete old image if it exists (only necessary on windows)
+                except FileNotFoundError:
+                    pass
                 shutil.move(currentPath, newPath)                                                       # move and rename map tile
+                canvas = self.get_traffic_canvas()
+                with Image.open(newPath) as tile:
+                    canvas.paste(tile, (y*200, x*200))                                                  # paste only the new tile into the map
             except:
-                self.debugLog("Error moving map tile (src: "+currentPath+", dest: "+newPath+")", True)
-                self.mapData["mapTiles"][x][y] = 0
+                self.debugLog("Error moving map tile (src: {}, dest: {})", currentPath, newPath, force=True)
+                self.mapData["mapTiles"][x,y] = 0
                 
             # check if all of the tiles are loaded
             if (self.checkTiles(ts)):
                 self.debugLog("Got complete traffic map")
                 self.mapData["mapComplete"] = True                                                      # map is complete
                 
-                # stitch the map tiles into one image
-                imgMap = Image.new("RGB", (600, 600), "white")                                          # create blank image for traffic map
-                for i in range(0,3):
-                    for j in range(0,3):
-                        tileFile = os.path.join(mapDir, "TrafficMap_{:g}_{:g}.png".format(i,j))         # get path to tile
-                        imgMap.paste(Image.open(tileFile), (j*200, i*200))                              # paste tile into map
-                        os.remove(tileFile)                                                             # delete tile image
-
-                # now put a timestamp on it. 
-                imgMap   = imgMap.convert("RGBA")
-                imgBig   = (981,981)                                                                     # size of a weather map
-                posTS    = (imgBig[0]-235, imgBig[1]-29)                                                 # calculate position to put timestamp (bottom right)
-                imgTS    = self.mkTimestamp(t, imgBig, posTS)                                            # create timestamp for a weather map
-                imgTS    = imgTS.resize((imgMap.size[0], imgMap.size[1]), imgLANCZOS)                 # resize it so it's proportional to the size of a traffic map (981 -> 600)
-                imgMap   = Image.alpha_composite(imgMap, imgTS)                                          # overlay timestamp on traffic map
+                # now put a timestamp on the stitched map. 
+                imgMap   = self.get_traffic_canvas().convert("RGBA")
+                imgTS    = self.mkTimestamp(t)                                                           # create timestamp for a weather map
+                scale    = imgMap.size[0]/981                                                            # keep it proportional to the size of a traffic map (981 -> 600)
+                imgTS    = imgTS.resize((round(imgTS.size[0]*scale), round(imgTS.size[1]*scale)), imgLANCZOS)
+                posTS    = (imgMap.size[0]-imgTS.size[0], imgMap.size[1]-imgTS.size[1])                  # calculate position to put timestamp (bottom right)
+                imgMap.alpha_composite(imgTS, posTS)                                                     # overlay timestamp on traffic map
 
                 imgMap.save(os.path.join(mapDir, "TrafficMap.png"))                                      # save traffic map
                 
-                # display on map page
-                if (self.radMapTraffic.get_active()):
+                # display on map page, or leave it for when the page is shown
+                if (self.radMapTraffic.get_active() and not self.map_page_visible()):
+                    self.mapStale = True
+                elif (self.radMapTraffic.get_active()):
                     img_size = min(self.alignmentMap.get_allocated_height(), self.alignmentMap.get_allocated_width()) - 12
-                    imgMap = imgMap.resize((img_size, img_size), imgLANCZOS)                         # scale map to fit window
+                    imgMap = scaleImage(imgMap, (img_size, img_size))                                   # scale map to fit window
+                    self.mapResizeGen += 1                                                              # drop any rescale still in flight
                     self.imgMap.set_from_pixbuf(imgToPixbuf(imgMap))                                    # convert image to pixbuf and display
                 
                 if (self.mapViewer is not None): self.mapViewer.updated(0)                              # notify map viwerer if it's open
     
+    def get_traffic_canvas(self):
+        global mapDir
+        # the traffic map is stitched in memory as tiles arrive, start it from the tiles kept on disk
+        if (self.trafficCanvas is None):
+            self.trafficCanvas = Image.new("RGB", (600, 600), "white")                                  # create blank image for traffic map
+            for i, j, pos, name in trafficTiles:
+                tileFile = os.path.join(mapDir, name)                                                   # get path to tile
+                if (os.path.isfile(tileFile)):
+                    with Image.open(tileFile) as tile:
+                        self.trafficCanvas.paste(tile, pos)                                             # paste tile into map
+        return self.trafficCanvas
+
     def processWeatherOverlay(self, fileName):
         global aasDir, mapDir, imgLANCZOS
-        r = re.compile("^[0-9]+_DWRO_(.*)_.*_([0-9]{4})([0-9]{2})([0-9]{2})_([0-9]{2})([0-9]{2})_([0-9A-Fa-f]+)[.].*$")                    # match file name
-        m = r.match(fileName)
+        m = dwroRegex.match(fileName)                                                                   # match file name
         
         if (m):
             # get time from map tile and convert to local time
@@ -1306,13 +1619,13 @@ class NRSC5_DUI(object):
                 if (id == ""):
                     self.debugLog("Received weather overlay before metadata, ignoring...");
                 else:
-                    self.debugLog("Received weather overlay with the wrong ID: " + m.group(1) + " (wanted " + id +")")
+                    self.debugLog("Received weather overlay with the wrong ID: {} (wanted {})", m.group(1), id)
                 return
             
             if (self.mapData["weatherTime"] == ts):
                 try:
                     os.remove(os.path.join(aasDir, fileName))                                           # delete this tile, it's not needed
-                except:
+                except OSError:
                     pass
                 return                                                                                  # no need to recreate the map if it hasn't changed
             
@@ -1324,40 +1637,49 @@ class NRSC5_DUI(object):
             
             # move new overlay to map directory
             try:
-                if(os.path.exists(wxOlPath)): os.remove(wxOlPath)                                       # delete old image if it exists (only necessary on windows)
+                try:
+                    os.remove(wxOlPath)                                                                 # delete old image if it exists (only necessary on windows)
+                except FileNotFoundError:
+                    pass
                 shutil.move(os.path.join(aasDir, fileName), wxOlPath)                                   # move and rename map tile
             except:
-                self.debugLog("Error moving weather overlay", True)
+                self.debugLog("Error moving weather overlay", force=True)
                 self.mapData["weatherTime"] = 0
                 
             # create weather map
             try:
                 mapPath = os.path.join(mapDir, "BaseMap_" + id + ".png")                                # get path to base map
-                if (os.path.isfile(mapPath) == False):                                                  # make sure base map exists
-                    self.makeBaseMap(self.mapData["weatherID"], self.mapData["weatherPos"])             # create base map if it doesn't exist
+                imgMap  = self.baseMaps.get(mapPath)                                                    # use the decoded base map if we have it
+                if (imgMap is None):
+                    if (os.path.isfile(mapPath) == False):                                              # make sure base map exists
+                        self.makeBaseMap(self.mapData["weatherID"], self.mapData["weatherPos"])         # create base map if it doesn't exist
+                    imgMap = Image.open(mapPath).convert("RGBA")                                        # open map image
+                    self.baseMaps[mapPath] = imgMap
                 
-                imgMap   = Image.open(mapPath).convert("RGBA")                                          # open map image
-                posTS    = (imgMap.size[0]-235, imgMap.size[1]-29)                                      # calculate position to put timestamp (bottom right)
-                imgTS    = self.mkTimestamp(t, imgMap.size, posTS)                                      # create timestamp
+                imgTS    = self.mkTimestamp(t)                                                          # create timestamp
+                posTS    = (imgMap.size[0]-imgTS.size[0], imgMap.size[1]-imgTS.size[1])                 # calculate position to put timestamp (bottom right)
                 imgRadar = Image.open(wxOlPath).convert("RGBA")                                         # open radar overlay
                 imgRadar = imgRadar.resize(imgMap.size, imgLANCZOS)                                  # resize radar overlay to fit the map
                 imgMap   = Image.alpha_composite(imgMap, imgRadar)                                      # overlay radar image on map
-                imgMap   = Image.alpha_composite(imgMap, imgTS)                                         # overlay timestamp
+                imgMap.alpha_composite(imgTS, posTS)                                                    # overlay timestamp
                 imgMap.save(wxMapPath)                                                                  # save weather map
                 os.remove(wxOlPath)                                                                     # remove overlay image
                 self.mapData["weatherNow"] = wxMapPath
                 
-                # display on map page
-                if (self.radMapWeather.get_active()):
+                # display on map page, or leave it for when the page is shown
+                if (self.radMapWeather.get_active() and not self.map_page_visible()):
+                    self.mapStale = True
+                elif (self.radMapWeather.get_active()):
                     img_size = min(self.alignmentMap.get_allocated_height(), self.alignmentMap.get_allocated_width()) - 12
-                    imgMap = imgMap.resize((img_size, img_size), imgLANCZOS)                         # scale map to fit window
+                    imgMap = scaleImage(imgMap, (img_size, img_size))                                   # scale map to fit window
+                    self.mapResizeGen += 1                                                              # drop any rescale still in flight
                     self.imgMap.set_from_pixbuf(imgToPixbuf(imgMap))                                    # convert image to pixbuf and display
                 
-                self.proccessWeatherMaps()                                                              # get rid of old maps and add new ones to the list
+                self.addWeatherMap(wxMapPath, ts)                                                       # add the new map to the list and get rid of old ones
                 if (self.mapViewer is not None): self.mapViewer.updated(1)                              # notify map viwerer if it's open
                     
             except:
-                self.debugLog("Error creating weather map", True)
+                self.debugLog("Error creating weather map", force=True)
                 self.mapData["weatherTime"] = 0
             
     def proccessWeatherInfo(self, fileName):
@@ -1370,108 +1692,126 @@ class NRSC5_DUI(object):
                 for line in weatherInfo:                                                                # read line by line
                     if ("DWR_Area_ID=" in line):                                                        # look for line with "DWR_Area_ID=" in it
                         # get ID from line
-                        r = re.compile("^DWR_Area_ID=\"(.+)\"$")
-                        m = r.match(line)
+                        m = dwrAreaRegex.match(line)
                         weatherID = m.group(1)
 
                     elif ("Coordinates=" in line):                                                      # look for line with "Coordinates=" in it
-                        # get coordinates from line
-                        r = re.compile("^Coordinates=.*[(](-?[0-9]+[.][0-9]+),(-?[0-9]+[.][0-9]+)[)].*[(](-?[0-9]+[.][0-9]+),(-?[0-9]+[.][0-9]+)[)].*$")
-                        m = r.match(line)
-                        weatherPos = [float(m.group(1)),float(m.group(2)), float(m.group(3)), float(m.group(4))]
+                        # get coordinates from line, it holds two "(lat,lon)" pairs
+                        first  = line.partition("(")[2]
+                        second = first.partition("(")[2]
+                        lat1, lon1 = first.partition(")")[0].split(",")
+                        lat2, lon2 = second.partition(")")[0].split(",")
+                        weatherPos = [float(lat1), float(lon1), float(lat2), float(lon2)]
         except:
-            self.debugLog("Error opening weather info", True)
+            self.debugLog("Error opening weather info", force=True)
         
         if (weatherID is not None and weatherPos is not None):                                          # check if ID and position were found
             if (self.mapData["weatherID"] != weatherID or self.mapData["weatherPos"] != weatherPos):    # check if ID or position has changed
-                self.debugLog("Got position: ({:n}, {:n}) ({:n}, {:n})".format(*weatherPos))
+                self.debugLog("Got position: ({:n}, {:n}) ({:n}, {:n})", *weatherPos)
                 self.mapData["weatherID"]  = weatherID                                                  # set weather ID
                 self.mapData["weatherPos"] = weatherPos                                                 # set weather map position
                 
                 self.makeBaseMap(weatherID, weatherPos)
-                self.weatherMaps = []
+                del self.weatherMaps[:]                                                                 # cleared in place, the map viewer shares this list
+                self.weatherTimes.clear()
                 self.proccessWeatherMaps()
     
     def proccessWeatherMaps(self):
         global mapDir
         numberOfMaps = 0
-        r     = re.compile("^.*map.WeatherMap_([a-zA-Z0-9]+)_([0-9]+).png")
-        now   = dtToTs(datetime.datetime.now(tz.tzutc()))                                               # get current time
-        files = glob.glob(os.path.join(mapDir, "WeatherMap_") + "*.png")                                # look for weather map files
+        cutoff = int(time.time()) - weatherMapMaxAge                                                    # old maps are removed
+        with os.scandir(mapDir) as entries:
+            files = [e.path for e in entries if e.name.startswith("WeatherMap_") and e.name.endswith(".png")] # look for weather map files
         files.sort()                                                                                    # sort files
         for f in files:  
-            m = r.match(f)                                                                              # match regex
+            m = weatherMapRegex.match(f)                                                                # match regex
             if (m):
                 id = m.group(1)                                                                         # location ID
                 ts = int(m.group(2))                                                                    # timestamp (UTC)
                 
                 # remove weather maps older than 12 hours
-                if (now - ts > 60*60*12):
+                if (ts < cutoff):
                     try:
-                        if (f in self.weatherMaps):
-                            self.weatherMaps.pop(self.weatherMaps.index(f))                             # remove from list
+                        if (self.weatherTimes.pop(f, None) is not None):
+                            self.weatherMaps.remove(f)                                                  # remove from list
                         os.remove(f)                                                                    # remove file
-                        self.debugLog("Deleted old weather map: " + f)
+                        self.debugLog("Deleted old weather map: {}", f)
                     except:
-                        self.debugLog("Error Failed to Delete: " + f)
+                        self.debugLog("Error Failed to Delete: {}", f)
                         
                 # skip if not the correct location
                 elif (id == self.mapData["weatherID"]):
-                    if (f not in self.weatherMaps):
+                    if (f not in self.weatherTimes):
+                        self.weatherTimes[f] = ts
                         self.weatherMaps.append(f)                                                      # add to list
                     numberOfMaps += 1
         
 
-        self.debugLog("Found {} weather maps".format(numberOfMaps))
+        self.debugLog("Found {} weather maps", numberOfMaps)
+    
+    def addWeatherMap(self, path, ts):
+        # add a newly made weather map to the list, and expire old ones from the front of it without rescanning the map directory
+        if (path not in self.weatherTimes):
+            self.weatherTimes[path] = ts
+            self.weatherMaps.append(path)
         
-    def getMapArea(self, lat1, lon1, lat2, lon2):
-        from math import asinh, tan, radians
+        cutoff = int(time.time()) - weatherMapMaxAge                                                    # old maps are removed
+        while (len(self.weatherMaps) > 1 and self.weatherTimes[self.weatherMaps[0]] < cutoff):
+            f = self.weatherMaps.pop(0)                                                                 # list is in time order, oldest first
+            del self.weatherTimes[f]
+            try:
+                os.remove(f)                                                                            # remove file
+                self.debugLog("Deleted old weather map: {}", f)
+            except OSError:
+                self.debugLog("Error Failed to Delete: {}", f)
         
+    def getMapArea(self, lat1, lon1, lat2, lon2):
         # get pixel coordinates from latitude and longitude
-        # calculations taken from https://github.com/KYDronePilot/hdfm
-        top  = asinh(tan(radians(52.482780)))
-        lat1 = top - asinh(tan(radians(lat1)))
-        lat2 = top - asinh(tan(radians(lat2)))
-        x1   = (lon1 + 130.781250) * 7162 / 39.34135
-        x2   = (lon2 + 130.781250) * 7162 / 39.34135
-        y1   = lat1 * 3565 / (top - asinh(tan(radians(38.898))))
-        y2   = lat2 * 3565 / (top - asinh(tan(radians(38.898))))
+        x1   = (lon1 + 130.781250) * mapProjXScale
+        x2   = (lon2 + 130.781250) * mapProjXScale
+        y1   = (mapProjTop - math.asinh(math.tan(math.radians(lat1)))) * mapProjYScale
+        y2   = (mapProjTop - math.asinh(math.tan(math.radians(lat2)))) * mapProjYScale
         
         return (int(round(x1)), int(round(y1)), int(round(x2)), int(round(y2)))
     
     def makeBaseMap(self, id, pos):
         global mapDir
         mapPath = os.path.join(mapDir, "BaseMap_" + id + ".png")                                # get map path
+        self.baseMaps.pop(mapPath, None)                                                        # forget the decoded copy, it's about to be rewritten
         if (os.path.isfile(self.mapFile)):
             if (os.path.isfile(mapPath) == False):                                              # check if the map has already been created for this location
-                self.debugLog("Creating new map: " + mapPath)
+                self.debugLog("Creating new map: {}", mapPath)
                 px     = self.getMapArea(*pos)                                                  # convert map locations to pixel coordinates        
-                mapImg = Image.open(self.mapFile).crop(px)                                      # open the full map and crop it to the coordinates
-                mapImg.save(mapPath)                                                            # save the cropped map to disk for later use
+                with Image.open(self.mapFile) as fullImg:                                       # open the full map (only the header is read here)
+                    if (px == (0, 0) + fullImg.size):
+                        shutil.copyfile(self.mapFile, mapPath)                                  # area covers the whole map, no need to decode it
+                    else:
+                        mapImg = fullImg.crop(px)                                               # crop it to the coordinates
+                        mapImg.save(mapPath)                                                    # save the cropped map to disk for later use
                 self.debugLog("Finished creating map")
         else:
-            self.debugLog("Error map file not found: " + self.mapFile, True)
+            self.debugLog("Error map file not found: {}", self.mapFile, force=True)
             mapImg = Image.new("RGBA", (pos[2]-pos[1], pos[3]-pos[1]), "white")                 # if the full map is not available, use a blank image
             mapImg.save(mapPath)
     
     def checkTiles(self, t):
         # check if all the tiles have been received
-        for i in range(0,3):
-            for j in range(0,3):
-                if (self.mapData["mapTiles"][i][j] != t):
-                    return False
-        return True
+        return bool((self.mapData["mapTiles"] == t).all())
     
-    def mkTimestamp(self, t, size, pos):
+    def mkTimestamp(self, t):
         global resDir
-        # create a timestamp image to overlay on the weathermap
-        x,y   = pos
-        text  = "{:04g}-{:02g}-{:02g} {:02g}:{:02g}".format(t.year, t.month, t.day, t.hour, t.minute)   # format timestamp
-        imgTS = Image.new("RGBA", size, (0,0,0,0))                                                      # create a blank image
+        # create a small timestamp tile to overlay in the corner of a map
+        text  = t.strftime("%Y-%m-%d %H:%M")                                                            # format timestamp
+        if (self.lastTimestamp is not None and self.lastTimestamp[0] == text):
+            return self.lastTimestamp[1]                                                                # same minute, reuse it
+        if (self.timestampBox is None):
+            self.timestampFont = ImageFont.truetype(os.path.join(resDir,"DejaVuSansMono.ttf"), 24)      # DejaVu Sans Mono 24pt font
+            self.timestampBox  = Image.new("RGBA", (235,29), (0,0,0,0))                                 # create a blank tile just big enough for the box
+            ImageDraw.Draw(self.timestampBox).rectangle((0,0, 231,25), outline="black", fill=(128,128,128,96)) # draw a box for the text
+        imgTS = self.timestampBox.copy()                                                                # start from the empty box
         draw  = ImageDraw.Draw(imgTS)                                                                   # the drawing object
-        font  = ImageFont.truetype(os.path.join(resDir,"DejaVuSansMono.ttf"), 24)                       # DejaVu Sans Mono 24pt font
-        draw.rectangle((x,y, x+231,y+25), outline="black", fill=(128,128,128,96))                       # draw a box around the text
-        draw.text((x+3,y), text, fill="black", font=font)                                               # draw the text
+        draw.text((3,0), text, fill="black", font=self.timestampFont)                                   # draw the text
+        self.lastTimestamp = (text, imgTS)
         return imgTS                                                                                    # return the image
 
     def checkPorts(self, port, type):
@@ -1482,40 +1822,54 @@ class NRSC5_DUI(object):
                     result = i
         return result
 
+    def feedback_key(self, line):
+        # nrsc5 lines look like "HH:MM:SS Keyword: value", a few (e.g. gain) have no timestamp
+        if (line[8:9] == " "):
+            line = line[9:]
+        key, sep, value = line.partition(":")
+        return key.strip(), value[1:]                                                                   # value follows ": "
+
     def parseFeedback(self, line):
         global aasDir, mapDir
         line = line.strip()
-        if (self.regex[4].match(line)):
-            # match title
-            m = self.regex[4].match(line)
-            self.streamInfo["Title"] = m.group(1)
-        elif (self.regex[5].match(line)):
-            # match artist
-            m = self.regex[5].match(line)
-            self.streamInfo["Artist"] = m.group(1)
-        elif (self.regex[6].match(line)):
-            # match album
-            m = self.regex[6].match(line)
-            self.streamInfo["Album"] = m.group(1)
-        elif (self.regex[15].match(line)):
-            # match genre
-            m = self.regex[15].match(line)
-            self.streamInfo["Genre"] = m.group(1)
-        elif (self.regex[3].match(line)):
+        key, value = self.feedback_key(line)
+
+        # lines that carry a plain value or none at all don't need a regex
+        field = feedbackFields.get(key)
+        if (field is not None):
+            # match title, artist, album, genre, station name, slogan, message or alert
+            if (getattr(self.streamInfo, field) != value):
+                setattr(self.streamInfo, field, value)
+                self.stationDirty = True
+            return
+        if (key in feedbackSyncStates):
+            # match synchronized, lost synch or lost device
+            self.set_synchronization(feedbackSyncStates[key])
+            return
+        if (key == "Open device failed."):
+            # match Open device failed
+            self.on_btnStop_clicked(None)
+            self.set_synchronization(-1)
+            return
+
+        r = self.regexByKey.get(key)
+        if (r is None):
+            return
+        m = r.match(value)                                                                              # only the text after "Keyword: " is left to match
+        if (not m):
+            return
+
+        if (key == "Audio bit rate"):
             # match audio bit rate
-            m = self.regex[3].match(line)
-            self.streamInfo["Bitrate"] = float(m.group(1))
-        elif (self.regex[8].match(line)):
+            self.streamInfo.Bitrate = float(m.group(1))
+        elif (key == "MER"):
             # match MER
-            m = self.regex[8].match(line)
-            self.streamInfo["MER"] = [float(m.group(1)), float(m.group(2))]
-        elif (self.regex[9].match(line)):
+            self.streamInfo.MER = [float(m.group(1)), float(m.group(2))]
+        elif (key == "BER"):
             # match BER
-            m = self.regex[9].match(line)
-            self.streamInfo["BER"] = [float(m.group(1)), float(m.group(2)), float(m.group(3)), float(m.group(4))]
-        elif (self.regex[13].match(line)):
+            self.streamInfo.BER = [float(m.group(1))*100, float(m.group(2))*100, float(m.group(3))*100, float(m.group(4))*100]
+        elif (key == "XHDR"):
             # match xhdr
-            m = self.regex[13].match(line)
             xhdr = m.group(1)
             mime = m.group(2)
             lot  = m.group(3)
@@ -1523,125 +1877,91 @@ class NRSC5_DUI(object):
                 self.lastXHDR = xhdr
                 self.lastLOT = lot
                 self.xhdrChanged = True
-                self.debugLog("XHDR Changed: {:s} (lot {:s})".format(xhdr,lot))
-        elif (self.regex[23].match(line)):
+                self.debugLog("XHDR Changed: {:s} (lot {:s})", xhdr, lot)
+        elif (key == "Stream data"):
             # match HERE Images
-            m = self.regex[23].match(line)
-            if (m):
-                p = int(m.group(1),16)
-                mime = m.group(2)
-                fileSize = int(m.group(3))
-                fileName = "HERE_Image.jpg"
-                # if (mime == "B7F03DFC"):
-                #    print (line)
-        elif (self.regex[7].match(line)):
+            p = int(m.group(1),16)
+            mime = m.group(2)
+            fileSize = int(m.group(3))
+            fileName = "HERE_Image.jpg"
+            # if (mime == "B7F03DFC"):
+            #    print (line)
+        elif (key == "LOT file"):
             # match album art
-            m = self.regex[7].match(line)
-            if (m):
-                fileName = "{}_{}".format(m.group(2),m.group(3))
-                fileSize = int(m.group(4))
-                headerOffset = int(len(m.group(2))) + 1
+            fileName = "{}_{}".format(m.group(2),m.group(3))
+            fileSize = int(m.group(4))
+            headerOffset = int(len(m.group(2))) + 1
 
-                p = int(m.group(1),16)
-                coverStream = self.checkPorts(p,0)
-                logoStream = self.checkPorts(p,1)
+            p = int(m.group(1),16)
+            coverStream = self.checkPorts(p,0)
+            logoStream = self.checkPorts(p,1)
 
-                # check file existance and size .. right now we just debug log
-                if (not os.path.isfile(os.path.join(aasDir,fileName))):
-                    self.debugLog("Missing file: " + fileName)
-                else:
-                    actualFileSize = os.path.getsize(os.path.join(aasDir,fileName))
-                    if (fileSize != actualFileSize):
-                        self.debugLog("Corrupt file: " + fileName + " (expected: "+str(fileSize)+" bytes, got "+str(actualFileSize)+" bytes)")
-
-                if (coverStream > -1):
-                    if coverStream == self.streamNum:
-                        #set cover only if downloading covers and including station covers
-                        if (self.cbCoverIncl.get_active() or (not self.cbCovers.get_active())):
-                            self.streamInfo["Cover"] = fileName
-                    self.debugLog("Got Album Cover: " + fileName)
-                elif (logoStream > -1):
-                    if logoStream == self.streamNum:
-                        self.streamInfo["Logo"] = fileName
-                    self.stationLogos[self.stationStr][logoStream] = fileName         # add station logo to database
-                    self.debugLog("Got Station Logo: "+fileName)
-
-                elif(fileName[headerOffset:(5+headerOffset)] == "DWRO_" and mapDir is not None):
-                    self.processWeatherOverlay(fileName)
-                elif(fileName[headerOffset:(4+headerOffset)] == "TMT_" and mapDir is not None):
-                    self.processTrafficMap(fileName)                                  # proccess traffic map tile
-                elif(fileName[headerOffset:(5+headerOffset)] == "DWRI_" and mapDir is not None):
-                    self.proccessWeatherInfo(fileName)
-
-        elif (self.regex[0].match(line)):
-            # match station name
-            m = self.regex[0].match(line)
-            self.streamInfo["Callsign"] = m.group(1)
-        elif (self.regex[2].match(line)):
-            # match station slogan
-            m = self.regex[2].match(line)
-            self.streamInfo["Slogan"] = m.group(1)
-        elif (self.regex[16].match(line)):
-            # match message
-            m = self.regex[16].match(line)
-            self.streamInfo["Message"] = m.group(1)
-        elif (self.regex[17].match(line)):
-            # match alert
-            m = self.regex[17].match(line)
-            self.streamInfo["Alert"] = m.group(1)
-        elif (self.regex[10].match(line)):
+            # check file existance and size .. right now we just debug log
+            try:
+                actualFileSize = os.stat(os.path.join(aasDir,fileName)).st_size
+            except OSError:
+                self.debugLog("Missing file: {}", fileName)
+            else:
+                if (fileSize != actualFileSize):
+                    self.debugLog("Corrupt file: {} (expected: {} bytes, got {} bytes)", fileName, fileSize, actualFileSize)
+
+            if (coverStream > -1):
+                if coverStream == self.streamNum:
+                    #set cover only if downloading covers and including station covers
+                    if (self.cbCoverIncl.get_active() or (not self.cbCovers.get_active())):
+                        self.streamInfo.Cover = fileName
+                self.debugLog("Got Album Cover: {}", fileName)
+            elif (logoStream > -1):
+                if logoStream == self.streamNum:
+                    self.streamInfo.Logo = fileName
+                self.set_station_logo(logoStream, fileName)                       # add station logo to database
+                self.forget_logo(os.path.join(aasDir,fileName))                   # drop any stale decoded copy
+                self.debugLog("Got Station Logo: {}", fileName)
+
+            elif (mapDir is not None):
+                handler = self.lotHandlers.get(fileName[headerOffset:].partition("_")[0])
+                if (handler is not None):
+                    handler(fileName)                                             # proccess weather overlay, traffic map tile or weather info
+
+        elif (key == "Best gain"):
             # match gain
-            m = self.regex[10].match(line)
-            self.streamInfo["Gain"] = float(m.group(1))
-        elif (self.regex[11].match(line)):
+            self.streamInfo.Gain = float(m.group(1))
+        elif (key == "SIG Service"):
             # match stream
-            m = self.regex[11].match(line)
             t = m.group(1)          # stream type
             s = int(m.group(2), 10) # stream number
             n = m.group(3)
 
-            self.debugLog("Found Stream: Type {:s}, Number {:02X}". format(t, s))
+            self.debugLog("Found Stream: Type {:s}, Number {:02X}", t, s)
+            self.stationDirty = True
             self.lastType = t
             if (t == "audio" and s >= 1 and s <= 8):
                 self.numStreams = s
-                self.streamInfo["Streams"][s-1] = n
+                self.streamInfo.Streams[s-1] = n
             if (t == "data"):
-                self.streamInfo["Services"][self.numServices] = n
+                self.streamInfo.Services[self.numServices] = n
                 self.numServices += 1
-        elif (self.regex[12].match(line)):
+        elif (key == "Data component"):
             # match port and data_service_type
-            m = self.regex[12].match(line)
             id = int(m.group(1), 10)
             p = int(m.group(2), 16)
             t = int(m.group(3), 10)
-            self.debugLog("\tFound Port: {:03X}". format(p))
+            self.debugLog("\tFound Port: {:03X}", p)
+            self.stationDirty = True
             
             if (self.lastType == "audio" and self.numStreams > 0):
                 self.streams[self.numStreams-1].append(p)
             if ((self.lastType == "data") and (id == 0) and (self.numServices > 0)):
-                self.streamInfo["SvcTypes"][self.numServices-1] = self.service_data_type_name(t)
-        elif (self.regex[18].match(line)):
+                self.streamInfo.SvcTypes[self.numServices-1] = serviceDataTypes.get(t, "")
+        elif (key == "Audio component"):
             # match program type
-            m = self.regex[18].match(line)
             id = int(m.group(1), 10)
             p = int(m.group(2), 16)
             t = int(m.group(3), 10)
             
             if ((self.lastType == "audio") and (id == 0) and (self.numStreams > 0)):
-                self.streamInfo["Programs"][self.numStreams-1] = self.program_type_name(t)
-        elif (self.regex[19].match(line)):
-            # match synchronized
-            self.set_synchronization(1)
-        elif (self.regex[20].match(line)):
-            # match lost synch
-            self.set_synchronization(0)
-        elif (self.regex[21].match(line)):
-            # match lost device
-            self.set_synchronization(-1)
-        elif (self.regex[22].match(line)):
-            # match Open device failed
-            self.on_btnStop_clicked(None)
-            self.set_synchronization(-1)
+                self.streamInfo.Programs[self.numStreams-1] = programTypes.get(t, "")
+                self.stationDirty = True
             
     def getControls(self):
         global resDir
@@ -1706,46 +2026,6 @@ class NRSC5_DUI(object):
         self.lblAlert      = builder.get_object("lblAlert")
         self.txtMessage2   = builder.get_object("txtMessage2")
         self.txtAlert2     = builder.get_object("txtAlert2")
-        self.btnAudioPrgs0 = builder.get_object("btn_audio_prgs0")
-        self.btnAudioPrgs1 = builder.get_object("btn_audio_prgs1")
-        self.btnAudioPrgs2 = builder.get_object("btn_audio_prgs2")
-        self.btnAudioPrgs3 = builder.get_object("btn_audio_prgs3")
-        self.btnAudioPrgs4 = builder.get_object("btn_audio_prgs4")
-        self.btnAudioPrgs5 = builder.get_object("btn_audio_prgs5")
-        self.btnAudioPrgs6 = builder.get_object("btn_audio_prgs6")
-        self.btnAudioPrgs7 = builder.get_object("btn_audio_prgs7")
-        self.btnAudioLbl0  = builder.get_object("btn_audio_lbl0")
-        self.btnAudioLbl1  = builder.get_object("btn_audio_lbl1")
-        self.btnAudioLbl2  = builder.get_object("btn_audio_lbl2")
-        self.btnAudioLbl3  = builder.get_object("btn_audio_lbl3")
-        self.btnAudioLbl4  = builder.get_object("btn_audio_lbl4")
-        self.btnAudioLbl5  = builder.get_object("btn_audio_lbl5")
-        self.btnAudioLbl6  = builder.get_object("btn_audio_lbl6")
-        self.btnAudioLbl7  = builder.get_object("btn_audio_lbl7")
-        self.lblAudioPrgs0 = builder.get_object("lbl_audio_prgs0")
-        self.lblAudioPrgs1 = builder.get_object("lbl_audio_prgs1")
-        self.lblAudioPrgs2 = builder.get_object("lbl_audio_prgs2")
-        self.lblAudioPrgs3 = builder.get_object("lbl_audio_prgs3")
-        self.lblAudioPrgs4 = builder.get_object("lbl_audio_prgs4")
-        self.lblAudioPrgs5 = builder.get_object("lbl_audio_prgs5")
-        self.lblAudioPrgs6 = builder.get_object("lbl_audio_prgs6")
-        self.lblAudioPrgs7 = builder.get_object("lbl_audio_prgs7")
-        self.lblAudioSvcs0 = builder.get_object("lbl_audio_svcs0")
-        self.lblAudioSvcs1 = builder.get_object("lbl_audio_svcs1")
-        self.lblAudioSvcs2 = builder.get_object("lbl_audio_svcs2")
-        self.lblAudioSvcs3 = builder.get_object("lbl_audio_svcs3")
-        self.lblAudioSvcs4 = builder.get_object("lbl_audio_svcs4")
-        self.lblAudioSvcs5 = builder.get_object("lbl_audio_svcs5")
-        self.lblAudioSvcs6 = builder.get_object("lbl_audio_svcs6")
-        self.lblAudioSvcs7 = builder.get_object("lbl_audio_svcs7")
-        self.lblDataSvcs0  = builder.get_object("lbl_data_svcs0")
-        self.lblDataSvcs1  = builder.get_object("lbl_data_svcs1")
-        self.lblDataSvcs2  = builder.get_object("lbl_data_svcs2")
-        self.lblDataSvcs3  = builder.get_object("lbl_data_svcs3")
-        self.lblDataType0  = builder.get_object("lbl_data_svcs10")
-        self.lblDataType1  = builder.get_object("lbl_data_svcs11")
-        self.lblDataType2  = builder.get_object("lbl_data_svcs12")
-        self.lblDataType3  = builder.get_object("lbl_data_svcs13")
         self.lblCall       = builder.get_object("lblCall")
         self.lblGain       = builder.get_object("lblGain")
         self.lblBitRate    = builder.get_object("lblBitRate")
@@ -1763,13 +2043,20 @@ class NRSC5_DUI(object):
         self.lvBookmarks   = builder.get_object("listviewBookmarks")
         self.lsBookmarks   = Gtk.ListStore(str, str, int)
         
+        # widgets for each audio and data stream, in stream order
+        self.audioPrgBtns = [builder.get_object("btn_audio_prgs{:d}".format(i)) for i in range(8)]
+        self.audioPrgLbls = [builder.get_object("btn_audio_lbl{:d}".format(i)) for i in range(8)]
+        self.audioPrgs    = [builder.get_object("lbl_audio_prgs{:d}".format(i)) for i in range(8)]
+        self.audioSvcs    = [builder.get_object("lbl_audio_svcs{:d}".format(i)) for i in range(8)]
+        self.dataSvcs     = [builder.get_object("lbl_data_svcs{:d}".format(i)) for i in range(4)]
+        self.dataTypes    = [builder.get_object("lbl_data_svcs1{:d}".format(i)) for i in range(4)]
+
         self.lvBookmarks.set_model(self.lsBookmarks)
         self.lvBookmarks.get_selection().connect("changed", self.on_lvBookmarks_selection_changed)
         
-        self.image1.set_from_pixbuf(GdkPixbuf.Pixbuf.new_from_file(os.path.join(resDir,"weather.png")))
-        self.imgNoSynch.set_from_pixbuf(GdkPixbuf.Pixbuf.new_from_file(os.path.join(resDir,"nosynch.png")))
-        self.imgSynch.set_from_pixbuf(GdkPixbuf.Pixbuf.new_from_file(os.path.join(resDir,"synchpilot.png")))
-        self.imgLostDevice.set_from_pixbuf(GdkPixbuf.Pixbuf.new_from_file(os.path.join(resDir,"lostdevice.png")))
+        # status icons, loaded straight into their images
+        for img, fileName in ((self.image1, "weather.png"), (self.imgNoSynch, "nosynch.png"), (self.imgSynch, "synchpilot.png"), (self.imgLostDevice, "lostdevice.png")):
+            img.set_from_file(os.path.join(resDir, fileName))
         self.btnMap.set_icon_widget(self.image1)
     
         self.mainWindow.connect("check-resize", self.on_cover_resize)
@@ -1781,26 +2068,8 @@ class NRSC5_DUI(object):
 
     def initStreamInfo(self):
         # stream information
-        self.streamInfo = {
-            "Callsign": "",         # station callsign
-            "Slogan": "",           # station slogan
-            "Message": "",          # station message
-            "Alert": "",            # station alert
-            "Title": "",            # track title
-            "Album": "",            # track album
-            "Genre": "",            # track genre
-            "Artist": "",           # track artist
-            "Cover": "",            # filename of track cover
-            "Logo": "",             # station logo
-            "Streams": ["","","","","","","",""], # audio stream names
-            "Programs": ["","","","","","","",""], # audio stream types
-            "Services": ["","","",""], # data service names
-            "SvcTypes": ["","","",""], # data service types
-            "Bitrate": 0,           # current stream bit rate
-            "MER": [0,0],           # modulation error ratio: lower, upper
-            "BER": [0,0,0,0],       # bit error rate: current, average, min, max
-            "Gain": 0               # automatic gain
-        }
+        self.streamInfo = StreamInfo()
+        self.stationDirty = True        # station and program labels need refreshing
         
         self.streams      = [[],[],[],[],[],[],[],[]]
         self.numStreams   = 0
@@ -1808,21 +2077,18 @@ class NRSC5_DUI(object):
         self.lastType     = 0
         
         # clear status info
+        self.lblCache = {}              # text last written to each status label
         self.lblCall.set_label("")
-        self.btnAudioLbl0.set_label("")
-        self.btnAudioLbl1.set_label("")
-        self.btnAudioLbl2.set_label("")
-        self.btnAudioLbl3.set_label("")
-        self.btnAudioLbl4.set_label("")
-        self.btnAudioLbl5.set_label("")
-        self.btnAudioLbl6.set_label("")
-        self.btnAudioLbl7.set_label("")
+        for lbl in self.audioPrgLbls:
+            lbl.set_label("")
         self.lblBitRate.set_label("")
         self.lblBitRate2.set_label("")
         self.lblError.set_label("")
         self.lblGain.set_label("")
         self.txtTitle.set_text("")
         self.txtArtist.set_text("")
+        self.prevTitle = ""
+        self.prevArtist = ""
         self.txtAlbum.set_text("")
         self.txtGenre.set_text("")
         self.imgCover.clear()
@@ -1840,54 +2106,13 @@ class NRSC5_DUI(object):
         if (self.txtAlert2):
             self.txtAlert2.set_label("")
             self.txtAlert2.set_tooltip_text("")
-        self.btnAudioPrgs0.set_sensitive(False)
-        self.btnAudioPrgs1.set_sensitive(False)
-        self.btnAudioPrgs2.set_sensitive(False)
-        self.btnAudioPrgs3.set_sensitive(False)
-        self.btnAudioPrgs4.set_sensitive(False)
-        self.btnAudioPrgs5.set_sensitive(False)
-        self.btnAudioPrgs6.set_sensitive(False)
-        self.btnAudioPrgs7.set_sensitive(False)
-        self.lblAudioPrgs0.set_label("")
-        self.lblAudioPrgs0.set_sensitive(False)
-        self.lblAudioPrgs1.set_label("")
-        self.lblAudioPrgs1.set_sensitive(False)
-        self.lblAudioPrgs2.set_label("")
-        self.lblAudioPrgs2.set_sensitive(False)
-        self.lblAudioPrgs3.set_label("")
-        self.lblAudioPrgs3.set_sensitive(False)
-        self.lblAudioPrgs4.set_label("")
-        self.lblAudioPrgs4.set_sensitive(False)
-        self.lblAudioPrgs5.set_label("")
-        self.lblAudioPrgs5.set_sensitive(False)
-        self.lblAudioPrgs6.set_label("")
-        self.lblAudioPrgs6.set_sensitive(False)
-        self.lblAudioPrgs7.set_label("")
-        self.lblAudioPrgs7.set_sensitive(False)
-        self.lblAudioSvcs0.set_label("")
-        self.lblAudioSvcs0.set_sensitive(False)
-        self.lblAudioSvcs1.set_label("")
-        self.lblAudioSvcs1.set_sensitive(False)
-        self.lblAudioSvcs2.set_label("")
-        self.lblAudioSvcs2.set_sensitive(False)
-        self.lblAudioSvcs3.set_label("")
-        self.lblAudioSvcs3.set_sensitive(False)
-        self.lblAudioSvcs4.set_label("")
-        self.lblAudioSvcs4.set_sensitive(False)
-        self.lblAudioSvcs5.set_label("")
-        self.lblAudioSvcs5.set_sensitive(False)
-        self.lblAudioSvcs6.set_label("")
-        self.lblAudioSvcs6.set_sensitive(False)
-        self.lblAudioSvcs7.set_label("")
-        self.lblAudioSvcs7.set_sensitive(False)
-        self.lblDataSvcs0.set_label("")
-        self.lblDataSvcs1.set_label("")
-        self.lblDataSvcs2.set_label("")
-        self.lblDataSvcs3.set_label("")
-        self.lblDataType0.set_label("")
-        self.lblDataType1.set_label("")
-        self.lblDataType2.set_label("")
-        self.lblDataType3.set_label("")
+        for btn in self.audioPrgBtns:
+            btn.set_sensitive(False)
+        for lbl in self.audioPrgs + self.audioSvcs:
+            lbl.set_label("")
+            lbl.set_sensitive(False)
+        for lbl in self.dataSvcs + self.dataTypes:
+            lbl.set_label("")
         self.lblMerLower.set_label("")
         self.lblMerUpper.set_label("")
         self.lblBerNow.set_label("")
@@ -1903,78 +2128,106 @@ class NRSC5_DUI(object):
         try:
             stationLogos = os.path.join(cfgDir,"stationLogos.json")
             if (os.path.isfile(stationLogos)):
-                with open(stationLogos, mode='r') as f:
-                    self.stationLogos = json.load(f)
+                self.stationLogos = loadJson(stationLogos)
                 for station in self.stationLogos:
                     while (len(self.stationLogos[station]) < 8):
                         self.stationLogos[station].append("")
+            
+            # replay the logo changes made since the database was last written
+            logoLog = os.path.join(cfgDir,"stationLogos.log")
+            if (os.path.isfile(logoLog)):
+                with open(logoLog, mode='r') as f:
+                    for line in f:
+                        try:
+                            station, stream, fileName = json.loads(line)
+                        except ValueError:
+                            continue                                                            # skip a partly written line
+                        self.stationLogos.setdefault(station, ["", "", "", "", "", "", "", ""])[stream] = fileName
+                        self.logoLogLines += 1
         except:
-            self.debugLog("Error: Unable to load station logo database", True)
+            self.debugLog("Error: Unable to load station logo database", force=True)
 
         #load cover metadata
         try:
             coverMetas = os.path.join(cfgDir,"coverMetas.json")
             if (os.path.isfile(coverMetas)):
-                with open(coverMetas, mode='r') as f:
-                    self.coverMetas = json.load(f)
+                self.coverMetas = loadJson(coverMetas)
+        except:
+            self.debugLog("Error: Unable to load cover metadata database", force=True)
+
+        #load covers that couldn't be found online, forgetting the ones that are due to be searched again
+        try:
+            coverMisses = os.path.join(cfgDir,"coverMisses.json")
+            if (os.path.isfile(coverMisses)):
+                cutoff = int(time.time()) - coverMissMaxAge
+                self.coverMisses = {k: v for k, v in loadJson(coverMisses).items() if v > cutoff}
         except:
-            self.debugLog("Error: Unable to load cover metadata database", True)
+            self.debugLog("Error: Unable to load cover miss database", force=True)
 
         self.mainWindow.resize(self.defaultSize[0],self.defaultSize[1])
 
         # load settings
-        try:
-            configFile = os.path.join(cfgDir,"config.json")
-            if (os.path.isfile(configFile)):
-                with open(configFile, mode='r') as f:
-                    config = json.load(f)
-                
-                if "MapData" in config:
-                    self.mapData = config["MapData"]
-                    if   (self.mapData["mapMode"] == 0):
-                        self.radMapTraffic.set_active(True)
-                        self.radMapTraffic.toggled()
-                    elif (self.mapData["mapMode"] == 1):
-                        self.radMapWeather.set_active(True)
-                        self.radMapWeather.toggled()
-                
-                if "Width" and "Height" in config:
-                    self.mainWindow.resize(config["Width"],config["Height"])
-                else:
-                    self.mainWindow.resize(self.defaultSize)
-
-                self.mainWindow.move(config["WindowX"], config["WindowY"])
-                self.spinFreq.set_value(config["Frequency"])
-                self.streamNum = config["Stream"]-1
-                if (self.streamNum < 0):
-                    self.streamNum = 0
-                self.set_program_btns()
-                self.spinGain.set_value(config["Gain"])
-                self.cbAutoGain.set_active(config["AutoGain"])
-                self.spinPPM.set_value(config["PPMError"])
-                self.spinRTL.set_value(config["RTL"])
-                if ("SDRRadio" in config):
-                    self.cbxSDRRadio.set_active_id("rcvr"+config["SDRRadio"])
-                if ("SDRPlaySer" in config):
-                    self.txtSDRPlaySer.set_text(config["SDRPlaySer"])
-                if ("SDRPlayAnt" in config):
-                    self.cbxSDRPlayAnt.set_active_id("ant"+config["SDRPlayAnt"])
-                self.cbLog.set_active(config["LogToFile"])
-                if ("DLoadArt" in config):
-                    self.cbCovers.set_active(config["DLoadArt"])
-                if ("StationArt" in config):
-                    self.cbCoverIncl.set_active(config["StationArt"])
-                if ("ExtendQ" in config):
-                    self.cbExtend.set_active(config["ExtendQ"])
-                if ("UseIP" in config):
-                    self.cbDevIP.set_active(config["UseIP"])
-                if ("DevIP" in config):
-                    self.txtDevIP.set_text(config["DevIP"])
-                self.bookmarks = config["Bookmarks"]
-                for bookmark in self.bookmarks:
-                    self.lsBookmarks.append(bookmark)
-        except:
-            self.debugLog("Error: Unable to load config", True)
+        config = {}
+        configFile = os.path.join(cfgDir,"config.json")
+        if (os.path.isfile(configFile)):
+            try:
+                config = loadJson(configFile)
+            except:
+                self.debugLog("Error: Unable to load config", force=True)
+
+        # a missing or bad value only loses that one setting
+        if "MapData" in config:
+            try:
+                mapData = config["MapData"]
+                mapData["mapTiles"] = numpy.array(mapData["mapTiles"], dtype=numpy.int64)
+                self.mapData = mapData
+            except:
+                self.debugLog("Error: Unable to load map data", force=True)
+            if   (self.mapData["mapMode"] == 0):
+                self.radMapTraffic.set_active(True)
+                self.radMapTraffic.toggled()
+            elif (self.mapData["mapMode"] == 1):
+                self.radMapWeather.set_active(True)
+                self.radMapWeather.toggled()
+
+        if ("Width" in config and "Height" in config):
+            self.mainWindow.resize(config["Width"],config["Height"])
+        else:
+            self.mainWindow.resize(self.defaultSize[0],self.defaultSize[1])
+        if ("WindowX" in config and "WindowY" in config):
+            self.mainWindow.move(config["WindowX"], config["WindowY"])
+        if ("Stream" in config):
+            self.streamNum = max(config["Stream"]-1, 0)
+            self.set_program_btns()
+
+        settings = (
+            ("Frequency",  self.spinFreq.set_value),
+            ("Gain",       self.spinGain.set_value),
+            ("AutoGain",   self.cbAutoGain.set_active),
+            ("PPMError",   self.spinPPM.set_value),
+            ("RTL",        self.spinRTL.set_value),
+            ("SDRRadio",   lambda v: self.cbxSDRRadio.set_active_id("rcvr"+v)),
+            ("SDRPlaySer", self.txtSDRPlaySer.set_text),
+            ("SDRPlayAnt", lambda v: self.cbxSDRPlayAnt.set_active_id("ant"+v)),
+            ("LogToFile",  self.cbLog.set_active),
+            ("DLoadArt",   self.cbCovers.set_active),
+            ("StationArt", self.cbCoverIncl.set_active),
+            ("ExtendQ",    self.cbExtend.set_active),
+            ("UseIP",      self.cbDevIP.set_active),
+            ("DevIP",      self.txtDevIP.set_text)
+        )
+        for key, setter in settings:
+            if (key in config):
+                try:
+                    setter(config[key])
+                except:
+                    self.debugLog("Error: Unable to load setting {}", key, force=True)
+
+        if ("Bookmarks" in config):
+            self.bookmarks = config["Bookmarks"]
+            for bookmark in self.bookmarks:
+                self.bookmarkIters[bookmark[2]] = self.lsBookmarks.append(bookmark)
+                self.index_bookmark(bookmark)
         
         # create cfg directory
         if (not os.path.isdir(cfgDir)):
@@ -1982,7 +2235,7 @@ class NRSC5_DUI(object):
                 os.mkdir(cfgDir)
                 self.debugLog("Needed to create config directory!")
             except:
-                self.debugLog("Error: Unable to create config directory", True)
+                self.debugLog("Error: Unable to create config directory", force=True)
                 cfgDir = None
 
         # create aas directory
@@ -1990,7 +2243,7 @@ class NRSC5_DUI(object):
             try:
                 os.mkdir(aasDir)
             except:
-                self.debugLog("Error: Unable to create AAS directory", True)
+                self.debugLog("Error: Unable to create AAS directory", force=True)
                 aasDir = None
         
         # create map directory
@@ -1998,27 +2251,20 @@ class NRSC5_DUI(object):
             try:
                 os.mkdir(mapDir)
             except:
-                self.debugLog("Error: Unable to create Map directory", True)
+                self.debugLog("Error: Unable to create Map directory", force=True)
                 mapDir = None
         
         # open log file
         try:
-            self.logFile = open("nrsc5.log", mode='a')
+            self.logFile = open("nrsc5.log", mode='ab')
         except:
-            self.debugLog("Error: Unable to create log file", True) 
+            self.debugLog("Error: Unable to create log file", force=True) 
     
     def shutdown(self, *args):
         global cfgDir
         # stop map viewer animation if it's running
-        if (self.mapViewer is not None and self.mapViewer.animateTimer is not None):
-            self.mapViewer.animateTimer.cancel()
-            self.mapViewer.animateStop = True
-            
-            while (self.mapViewer.animateBusy):
-                self.debugLog("Animation Busy - Stopping")
-                if (self.mapViewer.animateTimer is not None):
-                    self.mapViewer.animateTimer.cancel()
-                time.sleep(0.25)
+        if (self.mapViewer is not None):
+            self.mapViewer.stopAnimation()
         
         self.playing = False
         
@@ -2028,11 +2274,21 @@ class NRSC5_DUI(object):
         
         # shut down status timer if it's running
         if (self.statusTimer is not None):
-            self.statusTimer.cancel()
+            GLib.source_remove(self.statusTimer)
+            self.statusTimer = None
         
-        # wait for player thread to exit
-        if (self.playerThread is not None and self.playerThread.is_alive()):
-            self.playerThread.join(1)
+        # drop any cover searches that haven't started and have the running ones stop at their next request
+        self.coverStop = True
+        self.coverPool.shutdown(wait=False, cancel_futures=True)
+        self.resizePool.shutdown(wait=False, cancel_futures=True)
+
+        # stop watching the pty
+        if (self.nrsc5Watch is not None):
+            GLib.source_remove(self.nrsc5Watch)
+            self.nrsc5Watch = None
+        if (self.nrsc5WriteWatch is not None):
+            GLib.source_remove(self.nrsc5WriteWatch)
+            self.nrsc5WriteWatch = None
         
         # close log file if it's enabled
         if (self.logFile is not None):
@@ -2040,52 +2296,55 @@ class NRSC5_DUI(object):
         
         # save settings
         try:
-            with open(os.path.join(cfgDir,"config.json"), mode='w') as f:
-                winX, winY = self.mainWindow.get_position()
-                width, height = self.mainWindow.get_size()
-                config = {
-                    "CfgVersion": "1.1.0",
-                    "WindowX"   : winX,
-                    "WindowY"   : winY,
-                    "Width"     : width,
-                    "Height"    : height,
-                    "Frequency" : self.spinFreq.get_value(),
-                    "Stream"    : int(self.streamNum)+1,
-                    "Gain"      : self.spinGain.get_value(),
-                    "AutoGain"  : self.cbAutoGain.get_active(),
-                    "PPMError"  : int(self.spinPPM.get_value()),
-                    "RTL"       : int(self.spinRTL.get_value()),
-                    "DevIP"     : self.txtDevIP.get_text(),
-                    "SDRRadio"   : self.cbxSDRRadio.get_active_text(),
-                    "SDRPlaySer" : self.txtSDRPlaySer.get_text(),
-                    "SDRPlayAnt" : self.cbxSDRPlayAnt.get_active_text(),
-                    "LogToFile" : self.cbLog.get_active(),
-                    "DLoadArt"  : self.cbCovers.get_active(),
-                    "StationArt" : self.cbCoverIncl.get_active(),
-                    "ExtendQ"   : self.cbExtend.get_active(),
-                    "UseIP"     : self.cbDevIP.get_active(),
-                    "Bookmarks" : self.bookmarks,
-                    "MapData"   : self.mapData,
-                }
-                # sort bookmarks
-                config["Bookmarks"].sort(key=lambda t: t[2])
-                
-                json.dump(config, f, indent=2)
+            winX, winY = self.mainWindow.get_position()
+            width, height = self.mainWindow.get_size()
+            config = {
+                "CfgVersion": "1.1.0",
+                "WindowX"   : winX,
+                "WindowY"   : winY,
+                "Width"     : width,
+                "Height"    : height,
+                "Frequency" : self.spinFreq.get_value(),
+                "Stream"    : int(self.streamNum)+1,
+                "Gain"      : self.spinGain.get_value(),
+                "AutoGain"  : self.cbAutoGain.get_active(),
+                "PPMError"  : int(self.spinPPM.get_value()),
+                "RTL"       : int(self.spinRTL.get_value()),
+                "DevIP"     : self.txtDevIP.get_text(),
+                "SDRRadio"   : self.cbxSDRRadio.get_active_text(),
+                "SDRPlaySer" : self.txtSDRPlaySer.get_text(),
+                "SDRPlayAnt" : self.cbxSDRPlayAnt.get_active_text(),
+                "LogToFile" : self.cbLog.get_active(),
+                "DLoadArt"  : self.cbCovers.get_active(),
+                "StationArt" : self.cbCoverIncl.get_active(),
+                "ExtendQ"   : self.cbExtend.get_active(),
+                "UseIP"     : self.cbDevIP.get_active(),
+                "Bookmarks" : self.bookmarks,
+                "MapData"   : dict(self.mapData, mapTiles=self.mapData["mapTiles"].tolist()),
+            }
+            # sort bookmarks
+            config["Bookmarks"].sort(key=lambda t: t[2])
             
-            with open(os.path.join(cfgDir,"stationLogos.json"), mode='w') as f:
-                json.dump(self.stationLogos, f, indent=2)
-
-            with open(os.path.join(cfgDir,"coverMetas.json"), mode='w') as f:
-                json.dump(self.coverMetas, f, indent=2)
+            saveJson(os.path.join(cfgDir,"config.json"), config)
+            
+            # only rewrite the logo database once the change log has grown large
+            if (self.logoLogFailed or self.logoLogLines > 4*len(self.stationLogos)):
+                saveJson(os.path.join(cfgDir,"stationLogos.json"), self.stationLogos)
+                open(os.path.join(cfgDir,"stationLogos.log"), mode='w').close()                 # truncate the log
+            saveJson(os.path.join(cfgDir,"coverMetas.json"), self.coverMetas)
+            saveJson(os.path.join(cfgDir,"coverMisses.json"), self.coverMisses)
         except Exception as e:
             try:
                 print(e.message, e.args)
             except:
                 print(e)
-            self.debugLog("Error: Unable to save config", True)
+            self.debugLog("Error: Unable to save config", force=True)
     
-    def debugLog(self, message, force=False):
+    def debugLog(self, message, *args, force=False):
+        # arguments are only formatted into the message if it's actually going to be printed
         if (debugMessages or force):
+            if (args):
+                message = message.format(*args)
             now = datetime.datetime.now()
             print (now.strftime("%b %d %H:%M:%S : ") + message)
 
@@ -2128,11 +2387,16 @@ class NRSC5_Map(object):
         self.parent         = parent                                                # parent class
         self.callback       = callback                                              # callback function
         self.data           = data                                                  # map data
-        self.animateTimer   = None                                                  # timer used to animate weather maps
-        self.animateBusy    = False
-        self.animateStop    = False
+        self.animateTimer   = None                                                  # main loop timeout source used to animate weather maps
+        self.animateDelay   = None                                                  # interval of the running animation timeout, in seconds
         self.weatherMaps    = parent.weatherMaps                                    # list of weather maps sorted by time 
         self.mapIndex       = 0                                                     # the index of the next weather map to display
+        self.frameCache     = {}                                                    # decoded maps keyed by (file name, scaled), with the file's mtime
+        self.shownFrame     = None                                                  # surface (or pixbuf) currently displayed, if any
+        self.wantedFrame    = None                                                  # (file name, scaled) that should be on screen once it's decoded
+        self.decodePool     = concurrent.futures.ThreadPoolExecutor(max_workers=1) # worker that decodes and scales maps off the main loop
+        self.decoding       = set()                                                 # (file name, scaled) of decodes underway
+        self.closed         = False                                                 # window was closed, ignore decodes that finish afterwards
         
         # get the controls
         self.mapWindow      = builder.get_object("mapWindow")
@@ -2145,7 +2409,7 @@ class NRSC5_Map(object):
         self.adjSpeed       = builder.get_object("adjSpeed")
         self.imgKey         = builder.get_object("imgKey")
 
-        self.imgKey.set_from_pixbuf(GdkPixbuf.Pixbuf.new_from_file(os.path.join(resDir,"radar_key.png")))
+        self.imgKey.set_from_pixbuf(getRadarKey())
         self.mapWindow.connect("delete-event", self.on_mapWindow_delete)
         
         self.config = data["viewerConfig"]                                          # get the map viewer config
@@ -2168,9 +2432,7 @@ class NRSC5_Map(object):
                 self.imgKey.set_visible(False)                                      # hide the key for the weather radar
                 
                 # stop animation if it's enabled
-                if (self.animateTimer is not None):
-                    self.animateTimer.cancel()
-                    self.animateTimer = None
+                self.stopAnimation()
                 
                 self.setMap(0)                                                      # show the traffic map
                 
@@ -2180,8 +2442,7 @@ class NRSC5_Map(object):
                 
                 # check if animate is enabled and start animation
                 if (self.config["animate"] and self.animateTimer is None):
-                    self.animateTimer = Timer(0.05, self.animate)
-                    self.animateTimer.start()
+                    self.startAnimation(0.05)
                     
                 # no animation, just show the current map
                 elif(not self.config["animate"]):
@@ -2192,13 +2453,12 @@ class NRSC5_Map(object):
         
         if (self.config["animate"] and self.config["mode"] == 1):
             # start animation
-            self.animateTimer = Timer(self.config["animationSpeed"], self.animate)                      # create the animation timer
-            self.animateTimer.start()                                                                   # start the animation timer
+            self.stopAnimation()
+            self.preloadFrames()                                                                        # decode the frames ahead of the animation
+            self.startAnimation(self.config["animationSpeed"])                                          # start the animation timer
         else:
             # stop animation
-            if (self.animateTimer is not None):
-                self.animateTimer.cancel()                                                              # cancel the animation timer
-                self.animateTimer = None
+            self.stopAnimation()                                                                        # cancel the animation timer
             self.mapIndex = len(self.weatherMaps)-1                                                     # reset the animation index
             self.setMap(self.config["mode"])                                                            # show the most recent map
     
@@ -2206,8 +2466,10 @@ class NRSC5_Map(object):
         self.config["scale"] = btn.get_active()
         if (self.config["mode"] == 1):
             if (self.config["animate"]):
-                i = len(self.weatherMaps)-1 if (self.mapIndex-1 < 0) else self.mapIndex-1               # get the index for the current map in the animation
-                self.showImage(self.weatherMaps[i], self.config["scale"])                               # show the current map in the animation
+                count = len(self.weatherMaps)
+                if (count):
+                    i = (self.mapIndex-1) % count                                                       # get the index for the current map in the animation
+                    self.showImage(self.weatherMaps[i], self.config["scale"])                           # show the current map in the animation
             else:
                 self.showImage(self.data["weatherNow"], self.config["scale"])                           # show the most recent map
     
@@ -2215,64 +2477,121 @@ class NRSC5_Map(object):
         self.config["animationSpeed"] = self.adjSpeed.get_value()                                       # get the animation speed
     
     def on_mapWindow_delete(self, *args):
-        # cancel the timer if it's running
-        if (self.animateTimer is not None):
-            self.animateTimer.cancel()
-            self.animateStop = True
-        
-        # wait for animation to finish
-        while (self.animateBusy):
-            self.parent.debugLog("Waiting for animation to finish")
-            if (self.animateTimer is not None):
-                self.animateTimer.cancel()
-            time.sleep(0.25)
+        # cancel the timer if it's running and drop any decodes that haven't started
+        self.stopAnimation()
+        self.closed = True
+        self.decodePool.shutdown(wait=False, cancel_futures=True)
         
         self.config["windowPos"]  = self.mapWindow.get_position()                                       # store current window position
         self.config["windowSize"] = self.mapWindow.get_size()                                           # store current window size
         self.callback()                                                                                 # run the callback
     
+    def startAnimation(self, delay):
+        self.animateDelay = delay
+        self.animateTimer = GLib.timeout_add(int(delay*1000), self.animate)                             # show a frame every delay seconds
+    
+    def stopAnimation(self):
+        if (self.animateTimer is not None):
+            GLib.source_remove(self.animateTimer)                                                       # cancel the animation timer
+            self.animateTimer = None
+    
     def animate(self):
-        global imgLANCZOS
-        fileName = self.weatherMaps[self.mapIndex] if len(self.weatherMaps) else ""
-        if (os.path.isfile(fileName)):
-            self.animateBusy = True                                                                     # set busy to true
-            
-            if (self.config["scale"]):
-                mapImg = imgToPixbuf(Image.open(fileName).resize((600,600), imgLANCZOS))             # open weather map, resize to 600x600, and convert to pixbuf
-            else:
-                mapImg = imgToPixbuf(Image.open(fileName))                                              # open weather map and convert to pixbuf
-         
-            if (self.config["animate"] and self.config["mode"] == 1 and not self.animateStop):          # check if the viwer is set to animated weather map
-                self.imgMap.set_from_pixbuf(mapImg)                                                     # display image
-                self.mapIndex += 1                                                                      # incriment image index
-                if (self.mapIndex >= len(self.weatherMaps)):                                            # check if this is the last image
-                    self.mapIndex = 0                                                                   # reset the map index
-                    self.animateTimer = Timer(2, self.animate)                                          # show the last image for a longer time
-                else:
-                  self.animateTimer = Timer(self.config["animationSpeed"], self.animate)                # set the timer to the normal speed
-                 
-                self.animateTimer.start()                                                               # start the timer
-            else:
-               self.animateTimer = None                                                                 # clear the timer
-               
-            self.animateBusy = False                                                                    # set busy to false
-        else:
-            self.chkAnimate.set_active(False)                                                           # stop animation if image was not found
+        count    = len(self.weatherMaps)
+        if (count == 0):
+            self.animateTimer = None                                                                    # this timeout is finished, so there is nothing to cancel
+            self.chkAnimate.set_active(False)                                                           # stop animation if there are no maps
             self.mapIndex = 0
+            return False
+        if (not (self.config["animate"] and self.config["mode"] == 1)):                                 # check if the viwer is set to animated weather map
+            self.animateTimer = None                                                                    # this timeout is finished
+            return False
+        
+        fileName = self.weatherMaps[self.mapIndex % count]                                              # the list may have shrunk since the last frame
+        self.wantedFrame = (fileName, self.config["scale"])
+        mapImg = self.getFrame(fileName, self.config["scale"])                                          # decoded on the first pass only
+        if (mapImg is None):
+            return True                                                                                 # still decoding, try this frame again on the next tick
+        
+        self.showFrame(mapImg)                                                                          # display image
+        self.mapIndex = (self.mapIndex + 1) % count                                                     # incriment image index, wrapping after the last one
+        self.getFrame(self.weatherMaps[self.mapIndex], self.config["scale"])                            # have the worker decode the next frame meanwhile
+        
+        delay = 2 if (self.mapIndex == 0) else self.config["animationSpeed"]                            # show the last image for a longer time
+        if (delay == self.animateDelay):
+            return True                                                                                 # keep the current timeout running
+        self.startAnimation(delay)                                                                      # only replace it when the interval changes
+        return False
+    
+    def preloadFrames(self):
+        # queue every weather frame that isn't cached yet, the worker decodes them one after another
+        scale = self.config["scale"]
+        for fileName in self.weatherMaps:
+            if ((fileName, scale) not in self.frameCache):
+                self.getFrame(fileName, scale)
+    
+    def getFrame(self, fileName, scale):
+        # return the decoded map if it's cached and current, otherwise have the worker decode it and return None,
+        # frameDecoded then caches it and shows it if it's the frame that's wanted
+        key    = (fileName, scale)
+        cached = self.frameCache.get(key)
+        if (cached is not None and fileName in self.parent.weatherTimes):
+            return cached[1]                                                                            # weather maps are never rewritten, no need to stat them
+        if (cached is not None):
+            try:
+                if (cached[0] == os.stat(fileName).st_mtime_ns):
+                    return cached[1]
+            except OSError:
+                pass                                                                                    # let the worker report it
+        if (key not in self.decoding):
+            self.decoding.add(key)
+            future = self.decodePool.submit(decodeMap, fileName, scale)
+            future.add_done_callback(lambda f: GLib.idle_add(self.frameDecoded, key, f))
+        return None
+    
+    def frameDecoded(self, key, future):
+        self.decoding.discard(key)
+        if (self.closed):
+            return False
+        try:
+            mtime, pixbuf = future.result()
+        except (OSError, GLib.Error, concurrent.futures.CancelledError):
+            if (key == self.wantedFrame):
+                if (self.config["animate"] and self.config["mode"] == 1):
+                    self.stopAnimation()
+                    self.chkAnimate.set_active(False)                                                   # stop animation if image was not found
+                    self.mapIndex = 0
+                else:
+                    self.shownFrame = None
+                    self.imgMap.set_from_icon_name("MISSING_IMAGE", Gtk.IconSize.DIALOG)                # display missing image if file is not found
+            return False
+        frame = pixbuf
+        if (haveCairo):
+            frame = Gdk.cairo_surface_create_from_pixbuf(pixbuf, 1, None)                               # convert once here rather than every time gtk draws it
+        self.frameCache[key] = (mtime, frame)
+        if (key == self.wantedFrame):
+            self.showFrame(frame)
+        return False
     
     def showImage(self, fileName, scale):
-        global imgLANCZOS
-        
         if (os.path.isfile(fileName)):
-            if (scale):
-                mapImg = Image.open(fileName).resize((600,600), imgLANCZOS)                          # open and scale map to fit window
-            else:
-                mapImg = Image.open(fileName)                                                           # open map
-            
-            self.imgMap.set_from_pixbuf(imgToPixbuf(mapImg))                                            # convert image to pixbuf and display
+            self.wantedFrame = (fileName, scale)
+            frame = self.getFrame(fileName, scale)
+            if (frame is not None):
+                self.showFrame(frame)                                                                   # display the map, otherwise it's shown once decoded
         else:
+            self.wantedFrame = None
+            self.shownFrame = None
             self.imgMap.set_from_icon_name("MISSING_IMAGE", Gtk.IconSize.DIALOG)                        # display missing image if file is not found
     
+    def showFrame(self, frame):
+        # the cache hands back the same frame while the file is unchanged, so skip the redraw in that case
+        if (frame is not self.shownFrame):
+            self.shownFrame = frame
+            if (haveCairo):
+                self.imgMap.set_from_surface(frame)
+            else:
+                self.imgMap.set_from_pixbuf(frame)
+    
     def setMap(self, map):
         global mapDir
         if (map == 0):
@@ -2281,26 +2600,81 @@ class NRSC5_Map(object):
             self.showImage(self.data["weatherNow"], self.config["scale"])                    # show weather map
     
     def updated(self, imageType):
+        # forget maps that are no longer in the list
+        keep = set(self.weatherMaps)
+        for key in [k for k in list(self.frameCache) if k[0] not in keep]:
+            self.frameCache.pop(key, None)
+        
         if   (self.config["mode"] == 0):
             self.setMap(0)
         elif (self.config["mode"] == 1):
             self.setMap(1)
             self.mapIndex = len(self.weatherMaps)-1
+        
+        # have the new frames ready before the animation reaches them
+        if (imageType == 1 and self.config["animate"]):
+            self.preloadFrames()
 
 def dtToTs(dt):
-    # convert datetime to timestamp
-    return int((dt - datetime.datetime(1970, 1, 1, tzinfo=tz.tzutc())).total_seconds())
+    # convert datetime to timestamp, naive datetimes are taken to be UTC like tsToDt returns
+    if (dt.tzinfo is None):
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return int(dt.timestamp())
 
 def tsToDt(ts):
     # convert timestamp to datetime
     return datetime.datetime.utcfromtimestamp(ts)
 
+def scaleImage(img, size):
+    # downscale with LANCZOS, letting Pillow box-reduce by whole factors first on large reductions
+    if (img.size == tuple(size)):
+        return img                                                                                      # already the right size
+    return img.resize(size, imgLANCZOS, reducing_gap=2.0)
+
+def decodeMap(fileName, scale):
+    # runs on the map viewer's worker, returns the map's mtime and the map as a pixbuf, resized to 600x600 if scaled
+    mtime = os.stat(fileName).st_mtime_ns
+    if (scale):
+        with Image.open(fileName) as mapImg:
+            return mtime, imgToPixbuf(scaleImage(mapImg, (600,600)))
+    return mtime, GdkPixbuf.Pixbuf.new_from_file(fileName)                                              # unscaled, let gdk-pixbuf decode the file directly
+
+def getRadarKey():
+    # decode the radar key the first time a map viewer needs it and reuse it for every viewer after that
+    global radarKeyPixbuf
+    if (radarKeyPixbuf is None):
+        radarKeyPixbuf = GdkPixbuf.Pixbuf.new_from_file(os.path.join(resDir,"radar_key.png"))
+    return radarKeyPixbuf
+
 def imgToPixbuf(img):
     # convert PIL.Image to gdk.pixbuf
+    if (img.mode not in ("RGB", "RGBA")):
+        img = img.convert("RGBA")
+    if (img.mode == "RGBA" and img.getchannel("A").getextrema() == (255, 255)):
+        img = img.convert("RGB")                                                                        # fully opaque, so gtk doesn't have to premultiply and blend it
+    hasAlpha = (img.mode == "RGBA")
+    w, h = img.size
+    # tobytes() is already one contiguous buffer, GLib.Bytes.new wraps it with a single copy
     data = GLib.Bytes.new(img.tobytes())
-    return GdkPixbuf.Pixbuf.new_from_bytes(data, GdkPixbuf.Colorspace.RGB, 'A' in img.getbands(),
-                                           8, img.width, img.height, len(img.getbands())*img.width)
-
+    return GdkPixbuf.Pixbuf.new_from_bytes(data, GdkPixbuf.Colorspace.RGB, hasAlpha,
+                                           8, w, h, len(img.mode)*w)
+
+def loadJson(path):
+    # read a json file
+    if (orjson is not None):
+        with open(path, mode='rb') as f:
+            return orjson.loads(f.read())
+    with open(path, mode='r') as f:
+        return json.load(f)
+
+def saveJson(path, data):
+    # write a json file, indented so it stays readable
+    if (orjson is not None):
+        with open(path, mode='wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, mode='w') as f:
+            json.dump(data, f, indent=2)
 
 if __name__ == "__main__":
     # show main window and start main thread